@@ -434,16 +434,11 @@ class PyQuotexCLI:
         print("-" * 60)
 
         try:
-            while True:
-                candle_price_data = await self.client.get_realtime_price(asset_name)
-                if candle_price_data:
-                    latest_data = candle_price_data[-1]
-                    timestamp = latest_data['time']
-                    price = latest_data['price']
-                    formatted_time = time.strftime('%H:%M:%S', time.localtime(timestamp))
-
-                    print(f"📈 {asset} | {formatted_time} | Price: {price:.5f}", end="\r")
-                await asyncio.sleep(0.1)
+            async with self.client.ticks(asset_name) as ticks:
+                async for tick in ticks:
+                    formatted_time = time.strftime('%H:%M:%S', time.localtime(tick.time))
+
+                    print(f"📈 {asset} | {formatted_time} | Price: {tick.price:.5f}", end="\r")
         except KeyboardInterrupt:
             logger.info("Real-time price monitoring interrupted by user.")
             print("\n✅ Real-time monitoring stopped.")
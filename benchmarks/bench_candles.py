@@ -0,0 +1,68 @@
+# benchmarks/bench_candles.py
+
+import time
+import random
+import argparse
+import numpy as np
+from pyquotex.utils.services import group_by_period
+from pyquotex.utils.processor import calculate_candles
+
+
+def calculate_candles_loop(history, period):
+    """The per-tick implementation calculate_candles replaced, as a baseline."""
+    grouped = group_by_period(history, period)
+    candles = []
+    for minute, ticks in grouped.items():
+        candles.append({
+            'time': minute * period,
+            'open': ticks[0][1],
+            'close': ticks[-1][1],
+            'high': max(tick[1] for tick in ticks),
+            'low': min(tick[1] for tick in ticks),
+            'ticks': len(ticks)
+        })
+    return candles[:-1]
+
+
+def tick_history(count):
+    """Build ``history/list/v2`` tick rows, about two ticks per second."""
+    now = time.time() - count
+    price = 1.1
+    history = []
+    for index in range(count):
+        price += random.uniform(-0.0005, 0.0005)
+        history.append([round(now + index * 0.5 + random.uniform(0, 0.4), 3), round(price, 5), random.randint(0, 1)])
+    return history
+
+
+def best_of(function, history, period, repeat):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(history, period)
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="calculate_candles over large tick histories.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--period", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Ticks':>10} {'Loop':>10} {'Rows':>10} {'Array':>10} {'Speedup':>16}  Candles")
+    for size in args.sizes:
+        history = tick_history(size)
+        columns = np.array(history, dtype=np.float64)
+        loop, expected = best_of(calculate_candles_loop, history, args.period, args.repeat)
+        rows, result = best_of(calculate_candles, history, args.period, args.repeat)
+        array, from_array = best_of(calculate_candles, columns, args.period, args.repeat)
+        if result != expected or from_array != expected:
+            raise SystemExit(f"calculate_candles differs from the loop at {size} ticks")
+        print(f"{size:>10,} {loop:>9.3f}s {rows:>9.3f}s {array:>9.3f}s "
+              f"{loop / rows:>6.1f}x / {loop / array:>5.1f}x  {len(result)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_decoder.py
+
+import time
+import json
+import random
+import argparse
+import tracemalloc
+from pyquotex.ws.codec import Decoder, available_backends
+from pyquotex.ws.objects.tick import Tick
+
+
+def tick_frames(count):
+    now = time.time()
+    return [
+        b"\x04" + json.dumps([[f"ASSET{i % 120:03d}_otc", round(now + i * 0.01, 3),
+                                round(random.uniform(0.5, 150), 5), random.randint(0, 1)]]).encode()
+        for i in range(count)
+    ]
+
+
+def retained_bytes(frames, decoder, build):
+    """Bytes still allocated after storing every tick of ``frames``."""
+    store = []
+    tracemalloc.start()
+    for frame in frames:
+        for row in decoder.decode_binary(frame):
+            store.append(build(row))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(store)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick decoding throughput and allocations.")
+    parser.add_argument("--frames", type=int, default=200_000)
+    args = parser.parse_args()
+
+    frames = tick_frames(args.frames)
+    for backend in available_backends():
+        decoder = Decoder(backend)
+        start = time.perf_counter()
+        for frame in frames:
+            for row in decoder.decode_binary(frame):
+                Tick.from_row(row)
+        elapsed = time.perf_counter() - start
+        print(f"{backend:>8}: {len(frames) / elapsed:,.0f} ticks/s")
+
+    decoder = Decoder()
+    sample = frames[:50_000]
+    as_dict = retained_bytes(sample, decoder, lambda row: {"time": row[1], "price": row[2]})
+    as_tick = retained_bytes(sample, decoder, Tick.from_row)
+    print(f"Retained per tick: dict {as_dict:.0f} B, Tick {as_tick:.0f} B "
+          f"({100 * (1 - as_tick / as_dict):.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_dispatcher.py
+
+import time
+import json
+import random
+import argparse
+from pyquotex.api import QuotexAPI
+from pyquotex.ws.client import WebsocketClient
+from pyquotex.ws.objects.tickbuffer import TickBuffer
+
+
+def record_tick_traffic(assets, frames):
+    """Build frames shaped like a recorded ws2.qxbroker.com tick feed."""
+    traffic = []
+    prices = {asset: random.uniform(0.5, 150) for asset in assets}
+    now = time.time()
+    for index in range(frames // 2):
+        asset = random.choice(assets)
+        prices[asset] += random.uniform(-0.001, 0.001)
+        tick = [[asset, round(now + index * 0.01, 3), round(prices[asset], 5), random.randint(0, 1)]]
+        traffic.append('451-["quotes/stream",{"_placeholder":true,"num":0}]')
+        traffic.append(b"\x04" + json.dumps(tick).encode())
+    return traffic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebsocketClient.on_message throughput.")
+    parser.add_argument("--assets", type=int, default=120)
+    parser.add_argument("--frames", type=int, default=200_000)
+    args = parser.parse_args()
+
+    assets = [f"ASSET{i:03d}_otc" for i in range(args.assets)]
+    api = QuotexAPI("qxbroker.com", None, None, "pt")
+    api.current_asset = assets[0]
+    for asset in assets:
+        api.realtime_price[asset] = TickBuffer(asset, api.tick_capacity)
+    client = WebsocketClient(api)
+    traffic = record_tick_traffic(assets, args.frames)
+
+    start = time.perf_counter()
+    for frame in traffic:
+        client.on_message(None, frame)
+    client.ingress.drain()
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(len(api.realtime_price[asset]) for asset in assets)
+    print(f"Frames: {len(traffic)} ({ticks} ticks over {args.assets} assets)")
+    print(f"Elapsed: {elapsed:.3f}s")
+    print(f"Throughput: {len(traffic) / elapsed:,.0f} frames/s")
+    print(f"Ingress: {client.ingress.stats()}")
+
+
+if __name__ == "__main__":
+    main()
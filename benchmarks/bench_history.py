@@ -0,0 +1,96 @@
+# benchmarks/bench_history.py
+
+import time
+import json
+import asyncio
+import argparse
+from websockets.asyncio.server import serve
+from pyquotex.stable_api import Quotex
+from pyquotex.api import QuotexAPI
+from pyquotex.ws.async_client import AsyncWebsocketClient
+
+
+def history_frames(event, body):
+    return [
+        '451-["%s",{"_placeholder":true,"num":0}]' % event,
+        b"\x04" + json.dumps(body).encode()
+    ]
+
+
+async def reply(websocket, frames, rtt):
+    await asyncio.sleep(rtt)
+    for frame in frames:
+        await websocket.send(frame)
+
+
+def history_server(rtt):
+    """Serve ``history/list/v2`` and ``history/load`` replies after ``rtt`` seconds."""
+    async def handler(websocket):
+        await websocket.send("40")
+        async for message in websocket:
+            if not message.startswith("42["):
+                continue
+            packet = json.loads(message[2:])
+            event, payload = packet[0], packet[1] if len(packet) > 1 else None
+            now = int(time.time())
+            if event == "authorization":
+                frames = history_frames("s_authorization", {})
+            elif event == "instruments/update":
+                period = payload["period"] or 60
+                frames = history_frames("history/list/v2", {
+                    "asset": payload["asset"],
+                    "period": payload["period"],
+                    "history": [[now - 300 + i, 1.0 + i / 1000, 0] for i in range(300)],
+                    "candles": [[now - (60 - i) * period, 1, 2, 3, 0, 10] for i in range(60)]
+                })
+            elif event == "history/load":
+                frames = history_frames("history/load/%s" % payload["asset"], {
+                    "asset": payload["asset"],
+                    "index": payload["index"],
+                    "data": []
+                })
+            else:
+                continue
+            asyncio.create_task(reply(websocket, frames, rtt))
+    return handler
+
+
+async def main(args):
+    assets = [f"ASSET{i:03d}_otc" for i in range(args.assets)]
+    server = await serve(history_server(args.rtt), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    client = Quotex(email="bench", password="bench", transport="asyncio")
+    client.api = QuotexAPI("qxbroker.com", "bench", "bench", "pt", transport="asyncio")
+    client.api.wss_url = f"ws://127.0.0.1:{port}/socket.io/?EIO=3&transport=websocket"
+    client.api.session_data = {"user_agent": "bench"}
+    client.api.latency_report_interval = 0
+    client.api.current_asset = assets[0]
+    client.api.current_period = 60
+    client.api.websocket_client = AsyncWebsocketClient(client.api)
+    await client.api.websocket_client.connect()
+    await client.api.websocket_client.authorize("bench")
+
+    start = time.perf_counter()
+    for asset in assets:
+        await client.get_candles(asset, None, 3600, 60)
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.get_candles(asset, None, 3600, 60) for asset in assets))
+    concurrent = time.perf_counter() - start
+
+    print(f"Assets: {args.assets}, simulated RTT: {args.rtt * 1000:.0f} ms")
+    print(f"Serial:     {serial:.3f}s")
+    print(f"Concurrent: {concurrent:.3f}s ({serial / concurrent:.1f}x)")
+    print(f"Candles per asset: {len(results[0])}")
+
+    await client.api.websocket_client.close()
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serial versus concurrent get_candles scan.")
+    parser.add_argument("--assets", type=int, default=100)
+    parser.add_argument("--rtt", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -14,36 +14,34 @@ logging.basicConfig(
 logging.disable()
 
 
-async def get_candle(client, asset, lock):
-    async with lock:
-        candles_color = []
-        offset = 3600  # in seconds
-        period = 60  # in seconds
-        end_from_time = time.time()
-        candles = await client.get_candles(asset, end_from_time, offset, period)
-        candles_data = candles
+async def get_candle(client, asset):
+    candles_color = []
+    offset = 3600  # in seconds
+    period = 60  # in seconds
+    end_from_time = time.time()
+    candles = await client.get_candles(asset, end_from_time, offset, period)
+    candles_data = candles
 
-        if len(candles_data) > 0:
-            if not candles_data[0].get("open"):
-                candles = process_candles(candles_data, period)
-                candles_data = candles
+    if len(candles_data) > 0:
+        if not candles_data[0].get("open"):
+            candles = process_candles(candles_data, period)
+            candles_data = candles
 
-            print(asset, candles_data)
+        print(asset, candles_data)
 
-            for candle in candles_data:
-                color = get_color(candle)
-                candles_color.append(color)
+        for candle in candles_data:
+            color = get_color(candle)
+            candles_color.append(color)
 
-        # else:
-        #    print(f"{asset} - No candles.")
+    # else:
+    #    print(f"{asset} - No candles.")
 
-        print(f"\r{asset} - {time.strftime("%H:%M:%S")}", end="")
-        # await asyncio.sleep(0.1)
+    print(f"\r{asset} - {time.strftime("%H:%M:%S")}", end="")
 
 
 async def process_all_assets(client, assets):
-    lock = asyncio.Lock()
-    tasks = [asyncio.create_task(get_candle(client, asset, lock)) for asset in assets]
+    # History replies are matched per request, so every asset loads in parallel.
+    tasks = [asyncio.create_task(get_candle(client, asset)) for asset in assets]
     await asyncio.gather(*tasks)
 
 
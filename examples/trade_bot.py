@@ -99,27 +99,23 @@ async def check_result(buy_data, direction):
     """
     open_price = buy_data.get('openPrice')
 
-    while True:
-        prices = await client.get_realtime_price(buy_data['asset'])
-
-        if not prices:
-            continue
-
-        current_price = prices[-1]['price']
-
-        print(f"\nCurrent Price: {current_price}, Open Price: {open_price}")
-
-        if (direction == "call" and current_price > open_price) or (
-                direction == "put" and current_price < open_price):
-            print("Result: WIN")
-            return 'Win'
-        elif (direction == "call" and current_price <= open_price) or (
-                direction == "put" and current_price >= open_price):
-            print("Result: LOSS")
-            return 'Loss'
-        else:
-            print("Result: DOJI")
-            return 'Doji'
+    async with client.ticks(buy_data['asset']) as ticks:
+        async for tick in ticks:
+            current_price = tick.price
+
+            print(f"\nCurrent Price: {current_price}, Open Price: {open_price}")
+
+            if (direction == "call" and current_price > open_price) or (
+                    direction == "put" and current_price < open_price):
+                print("Result: WIN")
+                return 'Win'
+            elif (direction == "call" and current_price <= open_price) or (
+                    direction == "put" and current_price >= open_price):
+                print("Result: LOSS")
+                return 'Loss'
+            else:
+                print("Result: DOJI")
+                return 'Doji'
 
 
 async def trade_and_monitor():
@@ -11,7 +11,7 @@ import certifi
 import logging
 import platform
 import threading
-from . import global_value
+from .state import ConnectionState
 from .http.login import Login
 from .http.logout import Logout
 from .http.settings import Settings
@@ -24,8 +24,17 @@ from .ws.channels.sell_option import SellOption
 from .ws.objects.timesync import TimeSync
 from .ws.objects.candles import Candles
 from .ws.objects.profile import Profile
-from .ws.objects.listinfodata import ListInfoData
+from .ws.objects.tickbuffer import TickBuffer
+from .ws.objects.candleseries import CandleSeries
+from .ws.broker import TickBroker
+from .ws.metrics import BandwidthMeter, LatencyMonitor
 from .ws.client import WebsocketClient
+from .ws.async_client import AsyncWebsocketClient
+from .ws.pool import ConnectionPool
+from .ws.correlator import ReplyCorrelator
+from .ws.settlement import SettlementTracker
+from .ws.pending import PendingOrders
+from .ws.subscriptions import SubscriptionRegistry
 from collections import defaultdict
 
 urllib3.disable_warnings()
@@ -52,10 +61,46 @@ def nested_dict(n, type):
 
 class QuotexAPI(object):
     """Class for communication with Quotex API."""
-    socket_option_opened = {}
     buy_id = None
     pending_id = None
     trace_ws = False
+    coalesce_writes = False
+    heartbeat_interval = 5
+    heartbeat_jitter = 0.0
+    json_backend = None
+    ingress_capacity = 4096
+    ingress_coalesce_limit = 1024
+    ingress_policies = None
+    pool_size = 0
+    compression = False
+    latency_report_interval = 60
+    tick_capacity = 10000
+    coalesce_events = (
+        "tick",
+        "instruments/update",
+        "chart_notification/get",
+        "depth/follow",
+        "settings/store",
+    )
+    # Events whose frames are dropped instead of held over a disconnection.
+    unsafe_events = (
+        "orders/open",
+        "orders/cancel",
+        "pending/create",
+        "demo/refill",
+    )
+    # Attributes carried over to the API that replaces this one on reconnection.
+    session_state = (
+        "order_replies",
+        "history_replies",
+        "cancel_replies",
+        "events",
+        "settlements",
+        "pending_orders",
+        "tick_broker",
+        "realtime_price",
+        "candle_series",
+    )
     buy_expiration = None
     current_asset = None
     current_period = None
@@ -68,10 +113,6 @@ class QuotexAPI(object):
     profit_in_operation = None
     sold_options_respond = None
     sold_digital_options_respond = None
-    listinfodata = ListInfoData()
-    timesync = TimeSync()
-    candles = Candles()
-    profile = Profile()
 
     def __init__(
             self,
@@ -81,7 +122,8 @@ class QuotexAPI(object):
             lang,
             proxies=None,
             resource_path=None,
-            user_data_dir="."
+            user_data_dir=".",
+            transport="thread"
     ):
         """
         :param str host: The hostname or ip address of a Quotex server.
@@ -90,31 +132,51 @@ class QuotexAPI(object):
         :param str lang: The lang of a Quotex platform.
         :param proxies: The proxies of a Quotex server.
         :param user_data_dir: The path browser user data dir.
+        :param str transport: ``"thread"`` runs websocket-client in a daemon
+            thread, ``"asyncio"`` runs the websocket on the caller's event loop.
         """
         self.host = host
         self.https_url = f"https://{host}"
         self.wss_url = f"wss://ws2.{host}/socket.io/?EIO=3&transport=websocket"
         self.wss_message = None
+        self.state = ConnectionState()
+        self.socket_option_opened = {}
+        self.timesync = TimeSync()
+        self.candles = Candles()
+        self.profile = Profile()
         self.websocket_thread = None
         self.websocket_client = None
+        self.pool = None
         self.set_ssid = None
         self.object_id = None
         self.token_login2fa = None
         self.is_logged = False
-        self._temp_status = ""
         self.username = username
         self.password = password
         self.resource_path = resource_path
         self.user_data_dir = user_data_dir
         self.proxies = proxies
         self.lang = lang
+        self.transport = transport
         self.settings_list = {}
         self.signal_data = {}
         self.get_candle_data = {}
         self.historical_candles = {}
         self.candle_v2_data = {}
+        self.candle_series = {}
         self.realtime_price = {}
         self.realtime_price_data = []
+        self.tick_broker = TickBroker()
+        self.bandwidth = BandwidthMeter()
+        self.latency = LatencyMonitor()
+        self.order_replies = ReplyCorrelator()
+        self.history_replies = ReplyCorrelator()
+        self.cancel_replies = ReplyCorrelator()
+        # Wakes the coroutines waiting on pushed events, e.g. "balance".
+        self.events = ReplyCorrelator()
+        self.settlements = SettlementTracker()
+        self.pending_orders = PendingOrders()
+        self.subscriptions = SubscriptionRegistry(self)
         self.realtime_candles = {}
         self.realtime_sentiment = {}
         self.top_list_leader = {}
@@ -123,6 +185,21 @@ class QuotexAPI(object):
         self.browser.set_headers()
         self.settings = Settings(self)
 
+    def carry_over(self, previous):
+        """Take over the session state of the API this one replaces on reconnection.
+
+        Reply waiters, settlements, pending orders, tick buffers and tick
+        subscriptions outlive the websocket, so coroutines waiting on them,
+        e.g. in :meth:`Quotex.check_win <pyquotex.stable_api.Quotex.check_win>`
+        or an ``async for`` over :meth:`Quotex.ticks
+        <pyquotex.stable_api.Quotex.ticks>`, are fed by the new one.
+
+        :param previous: The replaced :class:`QuotexAPI`.
+        """
+        for name in self.session_state:
+            setattr(self, name, getattr(previous, name))
+        previous.subscriptions.attach(self)
+
     @property
     def websocket(self):
         """Property to get websocket.
@@ -131,9 +208,20 @@ class QuotexAPI(object):
         """
         return self.websocket_client.wss
 
+    def get_candle_series(self, asset, period):
+        """Return the :class:`CandleSeries <pyquotex.ws.objects.candleseries.CandleSeries>`
+        stored for ``(asset, period)``, creating it on first use."""
+        series = self.candle_series.get((asset, period))
+        if series is None:
+            series = self.candle_series[(asset, period)] = CandleSeries(asset, period)
+        return series
+
     def subscribe_realtime_candle(self, asset, period):
-        self.realtime_price[asset] = []
+        self.realtime_price[asset] = TickBuffer(asset, self.tick_capacity)
         self.realtime_candles[asset] = {}
+        return self.instruments_update(asset, period)
+
+    def instruments_update(self, asset, period):
         payload = {
             "asset": asset,
             "period": period
@@ -237,7 +325,6 @@ class QuotexAPI(object):
             "amount": amount
         }
         data = f'42["pending/create",{json.dumps(payload)}]'
-        print(data)
         # 42["pending/create",{"openType":0,"asset":"AUDCAD_otc","openTime":"2025-04-01T20:09:00.000Z","timeframe":60,"command":"call","amount":50}]
         # 42["pending/create",{"openType":0,"asset":"EURUSD_otc","openTime":"2025-04-01T20:11:00.000Z","timeframe":60,"command":"call","amount":5}]
         self.send_websocket_request(data)
@@ -248,7 +335,8 @@ class QuotexAPI(object):
             asset,
             direction,
             duration,
-            open_time
+            open_time,
+            ticket=None
     ):
         payload = {
             "amount": amount,
@@ -258,7 +346,7 @@ class QuotexAPI(object):
             "open_time": open_time,
             "open_type": 0,
             "symbol": asset,
-            "ticket": self.pending_id,
+            "ticket": ticket or self.pending_id,
             "timeframe": duration,
             "uid": self.profile.profile_id
         }
@@ -421,16 +509,40 @@ class QuotexAPI(object):
 
     def send_websocket_request(self, data, no_force_send=True):
         """Send websocket request to Quotex server.
+
+        The frame is put on the outbound queue and written by the single
+        writer, so the caller never waits for inbound processing.
+
         :param str data: The websocket request data.
-        :param bool no_force_send: Default None.
+        :param bool no_force_send: When ``False`` the frame jumps the queue.
         """
-        while (global_value.ssl_Mutual_exclusion
-               or global_value.ssl_Mutual_exclusion_write) and no_force_send:
-            pass
-        global_value.ssl_Mutual_exclusion_write = True
-        self.websocket.send(data)
+        if self.pool is not None:
+            self.pool.send(data, urgent=not no_force_send)
+        else:
+            self.websocket_client.send(data, urgent=not no_force_send)
         logger.debug(data)
-        global_value.ssl_Mutual_exclusion_write = False
+
+    def send_queue_stats(self):
+        """Return depth, counters and latency of the outbound queue."""
+        return self.websocket_client.sender.stats()
+
+    def ingress_stats(self):
+        """Return depth, high-water mark and drop counters of the inbound queue."""
+        return self.websocket_client.ingress.stats()
+
+    def pool_stats(self):
+        """Return the assets and send-queue counters of every pooled connection."""
+        if self.pool is None:
+            return []
+        return self.pool.stats()
+
+    def bandwidth_stats(self):
+        """Return bytes on the wire versus decoded bytes per event type."""
+        return self.bandwidth.stats()
+
+    def latency_stats(self, asset=None):
+        """Return the server-to-client and receive-to-callback tick lags per asset."""
+        return self.latency.snapshot(asset)
 
     async def authenticate(self):
         print("Connecting User Account ...")
@@ -446,17 +558,44 @@ class QuotexAPI(object):
         if not status:
             sys.exit(1)
 
-        global_value.SSID = self.session_data.get("token")
+        self.state.SSID = self.session_data.get("token")
 
         self.is_logged = True
 
     async def start_websocket(self):
-        global_value.check_websocket_if_connect = None
-        global_value.check_websocket_if_error = False
-        global_value.websocket_error_reason = None
-        if not global_value.SSID:
+        self.state.check_websocket_if_connect = None
+        self.state.check_websocket_if_error = False
+        self.state.websocket_error_reason = None
+        if not self.state.SSID:
             await self.authenticate()
+        if self.websocket_client:
+            self.websocket_client.stop()
+        if self.transport == "asyncio":
+            return await self.start_async_websocket()
         self.websocket_client = WebsocketClient(self)
+        self.websocket_thread = threading.Thread(
+            target=self.websocket.run_forever,
+            kwargs=self.websocket_options()
+        )
+        self.websocket_thread.daemon = True
+        self.websocket_thread.start()
+        while True:
+            if self.state.check_websocket_if_error:
+                return False, self.state.websocket_error_reason
+            elif self.state.check_websocket_if_connect == 0:
+                logger.debug("Websocket connection closed.")
+                return False, "Websocket connection closed."
+            elif self.state.check_websocket_if_connect == 1:
+                logger.debug("Websocket connected successfully!!!")
+                return True, "Websocket connected successfully!!!"
+            elif self.state.check_rejected_connection == 1:
+                self.state.SSID = None
+                logger.debug("Websocket Token Rejected.")
+                return True, "Websocket Token Rejected."
+            await asyncio.sleep(0.05)
+
+    def websocket_options(self):
+        """Return the ``run_forever`` options of the thread transport."""
         payload = {
             "suppress_origin": True,    # CloudFlare handshake status 403 forbidden fix
             "ping_interval": 24,
@@ -474,47 +613,42 @@ class QuotexAPI(object):
         }
         if platform.system() == "Linux":
             payload["sslopt"]["ssl_version"] = ssl.PROTOCOL_TLS
-        self.websocket_thread = threading.Thread(
-            target=self.websocket.run_forever,
-            kwargs=payload
-        )
-        self.websocket_thread.daemon = True
-        self.websocket_thread.start()
-        while True:
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-            elif global_value.check_websocket_if_connect == 0:
-                logger.debug("Websocket connection closed.")
-                return False, "Websocket connection closed."
-            elif global_value.check_websocket_if_connect == 1:
-                logger.debug("Websocket connected successfully!!!")
-                return True, "Websocket connected successfully!!!"
-            elif global_value.check_rejected_connection == 1:
-                global_value.SSID = None
-                logger.debug("Websocket Token Rejected.")
-                return True, "Websocket Token Rejected."
+        return payload
 
-    def send_ssid(self, timeout=10):
+    async def start_async_websocket(self):
+        """Open the websocket on the running event loop.
+
+        The handshake is awaited directly, so there is no thread and no
+        polling of the connection flags.
+        """
+        self.websocket_client = AsyncWebsocketClient(self)
+        try:
+            await self.websocket_client.connect(ssl_context)
+        except Exception as e:
+            self.websocket_client.on_error(None, e)
+            return False, self.state.websocket_error_reason
+        logger.debug("Websocket connected successfully!!!")
+        return True, "Websocket connected successfully!!!"
+
+    async def send_ssid(self, timeout=10):
         self.wss_message = None
-        if not global_value.SSID:
+        if not self.state.SSID:
             return False
 
-        self.ssid(global_value.SSID)
+        self.ssid(self.state.SSID)
         start_time = time.time()
 
         while self.wss_message is None:
             if time.time() - start_time > timeout:
                 return False
-            time.sleep(0.5)
+            await asyncio.sleep(0.5)
 
         return True
 
     async def connect(self, is_demo):
         """Method for connection to Quotex API."""
         self.account_type = is_demo
-        global_value.ssl_Mutual_exclusion = False
-        global_value.ssl_Mutual_exclusion_write = False
-        if global_value.check_websocket_if_connect:
+        if self.state.check_websocket_if_connect:
             logger.info("Closing websocket connection...")
             await self.close()
 
@@ -522,26 +656,55 @@ class QuotexAPI(object):
 
         if not check_websocket:
             return check_websocket, websocket_reason
-        check_ssid = self.send_ssid()
+        if self.transport == "asyncio":
+            check_ssid = await self.websocket_client.authorize(self.state.SSID)
+        else:
+            check_ssid = await self.send_ssid()
 
         if not check_ssid:
             await self.authenticate()
             if self.is_logged:
-                self.send_ssid()
+                if self.transport == "asyncio":
+                    await self.websocket_client.authorize(self.state.SSID)
+                else:
+                    await self.send_ssid()
+
+        if self.pool_size:
+            await self.start_pool()
 
         return check_websocket, websocket_reason
 
+    async def start_pool(self):
+        """Open the market connections of the pool once the session is authorized.
+
+        From then on the API's own websocket only carries orders and account
+        requests, see :class:`ConnectionPool <pyquotex.ws.pool.ConnectionPool>`.
+        """
+        self.pool = ConnectionPool(self, self.pool_size)
+        if self.transport == "asyncio":
+            await self.pool.start(ssl_context=ssl_context)
+        else:
+            await self.pool.start(options=self.websocket_options())
+
     async def reconnect(self):
         """Method for connection to Quotex API."""
         logger.info("Websocket Reconnection...")
         await self.start_websocket()
 
     async def close(self):
-        if self.websocket_client:
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        if isinstance(self.websocket_client, AsyncWebsocketClient):
+            await self.websocket_client.close()
+        elif self.websocket_client:
+            self.websocket_client.stop()
             self.websocket.close()
             await asyncio.sleep(1)
             self.websocket_thread.join()
         return True
 
     def websocket_alive(self):
+        if isinstance(self.websocket_client, AsyncWebsocketClient):
+            return self.websocket_client.is_alive()
         return self.websocket_thread.is_alive()
@@ -1,17 +1,16 @@
 import time
 import logging
 import asyncio
-from datetime import datetime
 from . import expiration
-from . import global_value
 from .api import QuotexAPI
+from .ws.subscriptions import SIGNALS
+from .ws.objects.candleseries import CandleSeries
 from .utils.services import truncate
 from .utils.processor import (
     calculate_candles,
-    process_candles_v2,
-    merge_candles,
     process_tick,
-    aggregate_candle
+    aggregate_candle,
+    MultiTimeframeBuilder
 )
 from .config import (
     load_session,
@@ -35,7 +34,8 @@ class Quotex:
             root_path=".",
             user_data_dir="browser",
             asset_default="EURUSD",
-            period_default=60
+            period_default=60,
+            transport="thread"
     ):
         self.size = [
             5,
@@ -60,6 +60,7 @@ class Quotex:
         self.user_data_dir = user_data_dir
         self.asset_default = asset_default
         self.period_default = period_default
+        self.transport = transport
         self.subscribe_candle = []
         self.subscribe_candle_all_size = []
         self.subscribe_mood = []
@@ -71,6 +72,18 @@ class Quotex:
         self.websocket_client = None
         self.websocket_thread = None
         self.debug_ws_enable = False
+        self.coalesce_writes = False
+        self.heartbeat_interval = 5
+        self.heartbeat_jitter = 0.0
+        self.ingress_capacity = 4096
+        self.ingress_coalesce_limit = 1024
+        self.ingress_policies = None
+        self.pool_size = 0
+        self.compression = False
+        self.latency_report_interval = 60
+        self.tick_capacity = 10000
+        self.profile_max_age = 3600
+        self.profile_fetched_at = 0
         self.resource_path = resource_path(root_path)
         session = load_session(user_agent)
         self.session_data = session
@@ -84,10 +97,16 @@ class Quotex:
         """
         return self.websocket_client.wss
 
-    @staticmethod
-    async def check_connect():
+    @property
+    def state(self):
+        """The :class:`ConnectionState <pyquotex.state.ConnectionState>` of this account."""
+        return self.api.state
+
+    async def check_connect(self):
+        if self.api.state.check_accepted_connection == 1:
+            return True
         await asyncio.sleep(2)
-        if global_value.check_accepted_connection == 1:
+        if self.api.state.check_accepted_connection == 1:
             return True
 
         return False
@@ -101,27 +120,28 @@ class Quotex:
         self.session_data = update_session(session)
 
     async def re_subscribe_stream(self):
-        try:
-            for ac in self.subscribe_candle:
-                sp = ac.split(",")
-                await self.start_candles_one_stream(sp[0], sp[1])
-        except:
-            pass
-        try:
-            for ac in self.subscribe_candle_all_size:
-                await self.start_candles_all_size_stream(ac)
-        except:
-            pass
-        try:
-            for ac in self.subscribe_mood:
-                await self.start_mood_stream(ac)
-        except:
-            pass
+        """Resubscribe every stream started on this client.
 
-    async def get_instruments(self):
-        while self.check_connect and self.api.instruments is None:
-            await asyncio.sleep(0.2)
-        return self.api.instruments or []
+        The websocket clients already do this on their own after a
+        reconnection; this forces a replay.
+
+        Returns:
+            int: The number of streams replayed.
+        """
+        return self.api.subscriptions.replay()
+
+    async def get_instruments(self, timeout: float = 10):
+        """Return the instruments list, waiting for it after a fresh connection.
+
+        Args:
+            timeout (float): Seconds to wait for the ``instruments/list`` push.
+
+        Returns:
+            list: The instruments, empty if none arrived in time.
+        """
+        instruments = await self.api.events.wait_until(
+            "instruments", lambda: self.api.instruments, timeout)
+        return instruments or []
 
     def get_all_asset_name(self):
         if self.api.instruments:
@@ -154,81 +174,160 @@ class Quotex:
 
         return self.codes_asset
 
-    async def get_candles(self, asset, end_from_time, offset, period, progressive=False):
-        if end_from_time is None:
-            end_from_time = time.time()
-        index = expiration.get_timestamp()
-        self.api.candles.candles_data = None
-        self.start_candles_stream(asset, period)
-        self.api.get_candles(asset, index, end_from_time, offset, period)
-        while True:
-            while self.check_connect and self.api.candles.candles_data is None:
-                await asyncio.sleep(0.1)
-            if self.api.candles.candles_data is not None:
-                break
+    async def get_candles(self, asset, end_from_time, offset, period, progressive=False, timeout: float = 10):
+        """Fetch the candles of an asset.
+
+        Replies are matched to the request by ``(asset, period)`` for the
+        ``history/list/v2`` snapshot and by the request ``index`` for
+        ``history/load``, so any number of calls can run concurrently, e.g.
+        under :func:`asyncio.gather`.
 
-        candles = self.prepare_candles(asset, period)
+        Args:
+            asset (str): The asset name.
+            end_from_time (float): End of the span, now if ``None``.
+            offset (int): Length of the span in seconds.
+            period (int): The candle period in seconds.
+            progressive (bool): Return the raw ``history/load`` candles.
+            timeout (float): Seconds to wait for the reply.
+
+        Returns:
+            list: The candles, oldest first; empty if no reply came in time.
+        """
+        message = await self.request_candles(asset, end_from_time, offset, period, progressive, timeout)
+        if message is None:
+            return []
 
         if progressive:
-            return self.api.historical_candles.get("data", {})
+            return message.get("data", {})
+
+        return self.prepare_candles(asset, period, message)
+
+    async def get_candle_series(self, asset, end_from_time, offset, period, timeout: float = 10):
+        """Fetch the candles of an asset as a columnar series.
+
+        Same request as :meth:`get_candles`, without building a dict per
+        candle; the columns of the series can be passed straight to
+        :class:`TechnicalIndicators`.
 
-        return candles
+        Args:
+            asset (str): The asset name.
+            end_from_time (float): End of the span, now if ``None``.
+            offset (int): Length of the span in seconds.
+            period (int): The candle period in seconds.
+            timeout (float): Seconds to wait for the reply.
+
+        Returns:
+            CandleSeries: The candles, oldest first; empty if no reply came
+            in time.
+
+        Example:
+            ```python
+            series = await client.get_candle_series("EURUSD_otc", None, 3600, 60)
+            rsi = TechnicalIndicators.calculate_rsi(series.close, 14)
+            ```
+        """
+        message = await self.request_candles(asset, end_from_time, offset, period, timeout=timeout)
+        if message is None:
+            return CandleSeries(asset, period)
+        return self.prepare_candle_series(asset, period, message)
 
-    async def get_history_line(self, asset, end_from_time, offset):
+    async def request_candles(self, asset, end_from_time, offset, period, progressive=False, timeout=10):
         if end_from_time is None:
             end_from_time = time.time()
-        index = expiration.get_timestamp()
+        replies = self.api.history_replies
+        index = replies.next_id()
+        key = index if progressive else (asset, period)
+        reply = replies.register(key)
+        self.ensure_candles_stream(asset, period, history=True)
+        self.api.get_candles(asset, index, end_from_time, offset, period)
+        try:
+            return await replies.result(key, reply, timeout)
+        finally:
+            self.api.subscriptions.done(asset, period)
+
+    async def get_history_line(self, asset, end_from_time, offset, timeout: float = 10):
+        if end_from_time is None:
+            end_from_time = time.time()
+        index = self.api.history_replies.next_id()
         self.api.current_asset = asset
-        self.api.historical_candles = None
-        self.start_candles_stream(asset)
+        reply = self.api.history_replies.register(index)
+        self.ensure_candles_stream(asset)
         self.api.get_history_line(self.codes_asset[asset], index, end_from_time, offset)
-        while True:
-            while self.check_connect and self.api.historical_candles is None:
-                await asyncio.sleep(0.2)
-            if self.api.historical_candles is not None:
-                break
-        return self.api.historical_candles
+        try:
+            return await self.api.history_replies.result(index, reply, timeout)
+        finally:
+            self.api.subscriptions.done(asset)
 
-    async def get_candle_v2(self, asset, period):
-        self.api.candle_v2_data[asset] = None
-        self.start_candles_stream(asset, period)
-        while self.api.candle_v2_data[asset] is None:
-            await asyncio.sleep(0.2)
-        candles = self.prepare_candles(asset, period)
-        return candles
+    async def get_candle_v2(self, asset, period, timeout: float = 10):
+        replies = self.api.history_replies
+        reply = replies.register((asset, period))
+        self.ensure_candles_stream(asset, period, history=True)
+        try:
+            message = await replies.result((asset, period), reply, timeout)
+        finally:
+            self.api.subscriptions.done(asset, period)
+        if message is None:
+            return []
+        return self.prepare_candles(asset, period, message)
 
-    def prepare_candles(self, asset: str, period: int):
+    def prepare_candles(self, asset: str, period: int, snapshot: dict = None):
         """
         Prepare candles data for a specified asset.
 
         Args:
             asset (str): Asset name.
             period (int): Period for fetching candles.
+            snapshot (dict): The ``history/list/v2`` payload of the asset,
+                the last one received if omitted.
 
         Returns:
             list: List of prepared candles data.
         """
-        candles_data = calculate_candles(self.api.candles.candles_data, period)
-        candles_v2_data = process_candles_v2(self.api.candle_v2_data, asset, candles_data)
-        new_candles = merge_candles(candles_v2_data)
+        return self.prepare_candle_series(asset, period, snapshot).to_list()
+
+    def prepare_candle_series(self, asset: str, period: int, snapshot: dict = None):
+        """Build the :class:`CandleSeries` of a ``history/list/v2`` snapshot.
 
-        return new_candles
+        The candles of the snapshot, but its first one, are completed with
+        the candles computed from its ticks; on equal times the server
+        candle is kept.
+        """
+        if snapshot is None:
+            snapshot = self.api.candle_v2_data.get(asset) or {}
+        series = CandleSeries.from_rows(asset, period, snapshot.get("candles", [])[1:])
+        series.merge(calculate_candles(snapshot.get("history", []), period))
+        return series
 
     async def connect(self):
+        previous = self.api
         self.api = QuotexAPI(
             "qxbroker.com",
             self.email,
             self.password,
             self.lang,
             resource_path=self.resource_path,
-            user_data_dir=self.user_data_dir
+            user_data_dir=self.user_data_dir,
+            transport=self.transport
         )
+        if previous is not None:
+            await previous.close()
+            self.api.carry_over(previous)
         await self.close()
         self.api.trace_ws = self.debug_ws_enable
+        self.api.coalesce_writes = self.coalesce_writes
+        self.api.heartbeat_interval = self.heartbeat_interval
+        self.api.heartbeat_jitter = self.heartbeat_jitter
+        self.api.ingress_capacity = self.ingress_capacity
+        self.api.ingress_coalesce_limit = self.ingress_coalesce_limit
+        self.api.ingress_policies = self.ingress_policies
+        self.api.pool_size = self.pool_size
+        self.api.compression = self.compression
+        self.api.latency_report_interval = self.latency_report_interval
+        self.api.tick_capacity = self.tick_capacity
         self.api.session_data = self.session_data
         self.api.current_asset = self.asset_default
         self.api.current_period = self.period_default
-        global_value.SSID = self.session_data.get("token")
+        self.api.state.SSID = self.session_data.get("token")
 
         if not self.session_data.get("token"):
             await self.api.authenticate()
@@ -262,16 +361,27 @@ class Quotex:
     def change_time_offset(self, time_offset):
         return self.api.change_time_offset(time_offset)
 
-    async def edit_practice_balance(self, amount=None):
+    async def edit_practice_balance(self, amount=None, timeout: float = 10):
         self.api.training_balance_edit_request = None
+        reply = self.api.events.register("training_balance")
         self.api.edit_training_balance(amount)
-        while self.api.training_balance_edit_request is None:
-            await asyncio.sleep(0.2)
-        return self.api.training_balance_edit_request
+        return await self.api.events.result("training_balance", reply, timeout)
 
-    async def get_balance(self):
-        while self.api.account_balance is None:
-            await asyncio.sleep(0.2)
+    async def get_balance(self, timeout: float = 10):
+        """Return the balance of the active account.
+
+        Args:
+            timeout (float): Seconds to wait for the first balance push.
+
+        Returns:
+            float: The balance plus the profit of the open trades, or
+                ``None`` if no balance arrived in time.
+        """
+        account = await self.api.events.wait_until(
+            "balance", lambda: self.api.account_balance, timeout)
+        if account is None:
+            logger.warning("No balance received within %ss.", timeout)
+            return None
         balance = self.api.account_balance.get("demoBalance") \
             if self.api.account_type > 0 else self.api.account_balance.get("liveBalance")
         return float(f"{truncate(balance + self.get_profit(), 2):.2f}")
@@ -311,15 +421,16 @@ class Quotex:
         # Ajustar history_size para asegurar suficientes velas según el timeframe
         adjusted_history = max(history_size, timeframe * 50)  # Asegurar al menos 50 velas
 
-        candles = await self.get_candles(asset, time.time(), adjusted_history, timeframe)
+        candles = await self.get_candle_series(asset, time.time(), adjusted_history, timeframe)
 
-        if not candles:
+        if not len(candles):
             return {"error": f"No hay datos disponibles para el activo {asset}"}
 
-        prices = [float(candle["close"]) for candle in candles]
-        highs = [float(candle["high"]) for candle in candles]
-        lows = [float(candle["low"]) for candle in candles]
-        timestamps = [candle["time"] for candle in candles]
+        # Las columnas se pasan sin copiarlas a TechnicalIndicators.
+        prices = candles.close
+        highs = candles.high
+        lows = candles.low
+        timestamps = candles.time.tolist()
 
         indicators = TechnicalIndicators()
         indicator = indicator.upper()
@@ -485,17 +596,17 @@ class Quotex:
                         required_periods = min_periods.get(indicator.upper(), 14)
                         if len(prices) < required_periods:
                             # Si no hay suficientes datos, obtener histórico
-                            historical_candles = await self.get_candles(
+                            historical_candles = await self.get_candle_series(
                                 asset,
                                 time.time(),
                                 timeframe * required_periods * 2,  # Doble del período requerido
                                 timeframe
                             )
-                            if historical_candles:
+                            if len(historical_candles):
                                 # Combinar datos históricos con tiempo real
-                                prices = [float(candle["close"]) for candle in historical_candles] + prices
-                                highs = [float(candle["high"]) for candle in historical_candles] + highs
-                                lows = [float(candle["low"]) for candle in historical_candles] + lows
+                                prices = historical_candles.close.tolist() + prices
+                                highs = historical_candles.high.tolist() + highs
+                                lows = historical_candles.low.tolist() + lows
 
                         indicators = TechnicalIndicators()
                         indicator = indicator.upper()
@@ -579,16 +690,26 @@ class Quotex:
         finally:
             # Limpiar suscripciones al salir
             try:
-                self.stop_candles_stream(asset)
+                self.stop_candles_stream(asset, timeframe)
             except:
                 pass
 
     async def get_profile(self):
-        return await self.api.get_profile()
+        profile = await self.api.get_profile()
+        self.profile_fetched_at = time.time()
+        return profile
 
     async def get_server_time(self):
-        user_settings = await self.get_profile()
-        offset_zone = user_settings.offset
+        """Compute the server time from the profile's time offset.
+
+        The profile is only fetched over HTTP when it is missing or older
+        than :attr:`profile_max_age` seconds, so orders do not pay an HTTP
+        round trip each.
+        """
+        profile = self.api.profile
+        if profile.profile_id is None or time.time() - self.profile_fetched_at > self.profile_max_age:
+            profile = await self.get_profile()
+        offset_zone = profile.offset
         self.api.timesync.server_timestamp = expiration.get_server_timer(offset_zone)
         return self.api.timesync.server_timestamp
 
@@ -613,63 +734,176 @@ class Quotex:
             time_mode (str): Time mode to buy.
 
         Returns:
-            The buy result.
+            tuple: ``(True, reply)`` once the ``orders/open`` reply carrying
+            this order's ``requestId`` arrives, ``(False, reason)`` if it was
+            rejected and ``(False, None)`` on timeout. Concurrent calls each
+            get their own reply.
 
         """
-        self.api.buy_id = None
-        request_id = expiration.get_timestamp()
+        request_id = self.api.order_replies.next_id()
         is_fast_option = time_mode.upper() == "TIME"
-        self.start_candles_stream(asset, duration)
         await self.get_server_time()
+        self.ensure_candles_stream(asset, duration)
+        reply = self.api.order_replies.register(request_id)
         self.api.buy(amount, asset, direction, duration, request_id, is_fast_option)
+        return await self.order_result(request_id, reply, duration, asset, duration)
 
-        count = 0.1
-        while self.api.buy_id is None:
-            count += 0.1
-            if count > duration:
-                status_buy = False
-                break
-            await asyncio.sleep(0.2)
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-        else:
-            status_buy = True
+    async def buy_many(self, orders: list, timeout: float = None):
+        """
+        Send a batch of binary option orders back-to-back.
+
+        The server time is read once and every order frame is queued before
+        any reply is awaited, so the orders reach the server within one
+        round trip instead of one round trip each.
 
-        return status_buy, self.api.buy_successful
+        Args:
+            orders (list): Dicts with the ``amount``, ``asset``, ``direction``,
+                ``duration`` and optional ``time_mode`` of each order.
+            timeout (float): Seconds to wait for each reply, the order's
+                duration if omitted.
+
+        Returns:
+            list: One future per order, in order, each resolving to the
+            ``(status, reply)`` tuple of :meth:`buy`.
+
+        """
+        await self.get_server_time()
+        self.api.send_websocket_request('42["tick"]')
+        results = []
+        for order in orders:
+            duration = order["duration"]
+            is_fast_option = order.get("time_mode", "TIME").upper() == "TIME"
+            request_id = self.api.order_replies.next_id()
+            self.ensure_candles_stream(order["asset"], duration)
+            reply = self.api.order_replies.register(request_id)
+            self.api.buy(
+                order["amount"],
+                order["asset"],
+                order["direction"],
+                duration,
+                request_id,
+                is_fast_option,
+                tick=False
+            )
+            results.append(asyncio.ensure_future(
+                self.order_result(request_id, reply, timeout or duration, order["asset"], duration)
+            ))
+        return results
+
+    async def order_result(self, request_id, reply, timeout, asset, period):
+        """Wait for the ``orders/open`` reply of one order.
+
+        The candle stream reference the order took is kept until the order
+        settles, or dropped at once if the order never opened.
+        """
+        try:
+            message = await asyncio.wait_for(reply, timeout)
+        except asyncio.TimeoutError:
+            self.api.order_replies.discard(request_id, reply)
+            self.api.subscriptions.done(asset, period)
+            return False, None
+        if message.get("error"):
+            self.api.subscriptions.done(asset, period)
+            return False, message.get("error")
+        self.api.subscriptions.hold(message.get("id"), asset, period)
+        return True, message
 
     async def open_pending(self, amount: float, asset: str, direction: str, duration: int, open_time: str = None):
-        self.api.pending_id = None
-        user_settings = await self.get_profile()
-        offset_zone = user_settings.offset
+        """
+        Schedule a pending order.
+
+        The profile is only fetched over HTTP when the cached one is stale,
+        see :meth:`get_server_time`; the reply is matched to this order, so
+        many pending orders can be scheduled at once.
+
+        Args:
+            amount (float): Amount to buy.
+            asset (str): Asset to buy.
+            direction (str): Direction to buy.
+            duration (int): Duration of the trade in seconds.
+            open_time (str, optional): Opening time as ``"dd/mm HH:MM"``, the
+                next timeframe if omitted.
+
+        Returns:
+            tuple: ``(True, reply)`` once the ``pending/create`` reply arrives
+            and ``instruments/follow`` was sent, ``(False, reason)`` if it was
+            rejected and ``(False, None)`` on timeout.
+        """
+        await self.get_server_time()
         open_time = expiration.get_next_timeframe(
             int(time.time()),
-            offset_zone,
+            self.api.profile.offset,
             duration,
             open_time
         )
+        reply = self.api.pending_orders.expect(asset, open_time)
         self.api.open_pending(amount, asset, direction, duration, open_time)
-        count = 0.1
-        while self.api.pending_id is None:
-            count += 0.1
-            if count > duration:
-                status_buy = False
-                break
-            await asyncio.sleep(0.2)
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-        else:
-            status_buy = True
-            self.api.instruments_follow(amount, asset, direction, duration, open_time)
+        try:
+            message = await asyncio.wait_for(reply, duration)
+        except asyncio.TimeoutError:
+            self.api.pending_orders.discard(asset, open_time, reply)
+            return False, None
+        if message.get("error"):
+            return False, message.get("error")
+        ticket = message["pending"]["ticket"]
+        self.api.instruments_follow(amount, asset, direction, duration, open_time, ticket)
+        self.api.pending_orders.follow(ticket)
+        return True, message
+
+    async def wait_pending_open(self, ticket: str, timeout: float = None):
+        """Wait for a pending order to open at its scheduled time.
 
-        return status_buy, self.api.pending_successful
+        Args:
+            ticket (str): The ticket of the pending order.
+            timeout (float, optional): Seconds to wait, forever if omitted.
 
-    async def sell_option(self, options_ids):
-        """Sell asset Quotex"""
-        self.api.sell_option(options_ids)
-        self.api.sold_options_respond = None
-        while self.api.sold_options_respond is None:
-            await asyncio.sleep(0.2)
-        return self.api.sold_options_respond
+        Returns:
+            dict: The pending order with its ``state`` and the ``deal`` id,
+            or ``None`` on timeout.
+        """
+        try:
+            return await asyncio.wait_for(self.api.pending_orders.wait_opened(ticket), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def get_pending_order(self, ticket: str):
+        """Return a pending order with its ``state``, or ``None`` if unknown.
+
+        The state is ``created``, ``following``, ``opened`` or ``cancelled``.
+        """
+        return self.api.pending_orders.get(ticket)
+
+    async def sell_option(self, options_ids, timeout: float = 10):
+        """Sell asset Quotex.
+
+        A list of tickets is cancelled in bulk: every ``orders/cancel`` frame
+        is written back-to-back and the replies are collected together, so
+        flattening many positions takes about one round trip.
+
+        Args:
+            options_ids: One ticket or a list of tickets.
+            timeout (float): Seconds to wait for the replies.
+
+        Returns:
+            The reply of a single ticket, or a dict mapping every ticket of a
+            list to its reply; ``None`` for tickets without a reply in time.
+        """
+        tickets = options_ids if isinstance(options_ids, list) else [options_ids]
+        replies = {ticket: self.api.cancel_replies.register(ticket) for ticket in tickets}
+        if not replies:
+            return {}
+        self.api.sell_option(list(replies))
+        await asyncio.wait(replies.values(), timeout=timeout)
+        results = {}
+        for ticket, reply in replies.items():
+            if reply.done():
+                results[ticket] = reply.result()
+            else:
+                self.api.cancel_replies.discard(ticket, reply)
+                results[ticket] = None
+        if isinstance(options_ids, list):
+            return results
+        return results[options_ids]
 
     def get_payment(self):
         """Payment Quotex server"""
@@ -711,40 +945,89 @@ class Quotex:
 
         return data.get("profit").get(f"{timeframe}M")
 
-    async def start_remaing_time(self):
-        now_stamp = datetime.fromtimestamp(expiration.get_timestamp())
-        expiration_stamp = datetime.fromtimestamp(self.api.timesync.server_timestamp)
-        remaing_time = int((expiration_stamp - now_stamp).total_seconds())
-        while remaing_time >= 0:
-            remaing_time -= 1
-            print(f"\rRemaining {remaing_time if remaing_time > 0 else 0} seconds...", end="")
-            await asyncio.sleep(1)
-
-    async def check_win(self, id_number: int):
-        """Check win based id"""
-        task = asyncio.create_task(
-            self.start_remaing_time()
-        )
-        while True:
-            data_dict = self.api.listinfodata.get(id_number)
-            if data_dict and data_dict.get("game_state") == 1:
-                break
-            await asyncio.sleep(0.2)
-        task.cancel()
-        self.api.listinfodata.delete(id_number)
-        return data_dict["win"]
+    async def check_win(self, id_number: int, timeout: float = None):
+        """Check win based id.
+
+        Waits for the ``deals`` message closing this ticket; any number of
+        trades can be checked concurrently. :meth:`get_profit` then returns
+        the profit of this ticket.
+
+        Args:
+            id_number (int): The ``id`` of the order, as returned by :meth:`buy`.
+            timeout (float, optional): Seconds to wait, forever if omitted.
+
+        Returns:
+            bool: Whether the trade won, or ``None`` on timeout.
+        """
+        deal = await self.wait_settlement(id_number, timeout)
+        if deal is None:
+            return None
+        self.api.profit_in_operation = deal.get("profit")
+        return deal["win"]
+
+    async def wait_settlement(self, ticket: str, timeout: float = None):
+        """Wait for a trade to close.
+
+        Args:
+            ticket (str): The ``id`` of the order, as returned by :meth:`buy`.
+            timeout (float, optional): Seconds to wait, forever if omitted.
+
+        Returns:
+            dict: The closed deal with its ``profit`` and ``win``, or
+            ``None`` on timeout.
+        """
+        try:
+            return await asyncio.wait_for(self.api.settlements.wait(ticket), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def settlements(self, maxlen: int = 1024):
+        """Stream every trade as it closes.
+
+        Must be called from a coroutine; the stream sees the deals closed
+        after it was created.
+
+        Args:
+            maxlen (int): Deals buffered for a slow consumer.
+
+        Returns:
+            TickSubscription: An async iterator of closed deals.
+
+        Example:
+            async with client.settlements() as closed:
+                async for deal in closed:
+                    print(deal["id"], deal["win"], deal["profit"])
+        """
+        return self.api.settlements.subscribe(maxlen)
 
     def start_candles_stream(self, asset: str = "EURUSD", period: int = 0):
         """Start streaming candle data for a specified asset.
 
+        Streams are reference-counted per (asset, period): the subscribe
+        frames are only sent by the first call, and the stream stays up until
+        every call has been matched by :meth:`stop_candles_stream`.
+
         Args:
             asset (str): The asset to stream data for.
             period (int, optional): The period for the candles. Defaults to 0.
         """
         self.api.current_asset = asset
-        self.api.subscribe_realtime_candle(asset, period)
-        self.api.chart_notification(asset)
-        self.api.follow_candle(asset)
+        self.api.subscriptions.acquire(asset, period)
+
+    def ensure_candles_stream(self, asset: str, period: int = 0, history: bool = False):
+        """Make sure a candle stream is up for an order or a history fetch.
+
+        The reference it takes is dropped once the reply arrived or the
+        order settled, so it never keeps a stream the user unsubscribed.
+
+        Args:
+            asset (str): The asset to stream data for.
+            period (int, optional): The period for the candles. Defaults to 0.
+            history (bool, optional): Request a fresh ``history/list/v2``
+                snapshot even if the stream is already up.
+        """
+        self.api.current_asset = asset
+        self.api.subscriptions.ensure(asset, period, history)
 
     async def store_settings_apply(
             self,
@@ -753,7 +1036,8 @@ class Quotex:
             time_mode: str = "TIMER",
             deal: int = 5,
             percent_mode: bool = False,
-            percent_deal: int = 1
+            percent_deal: int = 1,
+            timeout: float = 10
     ):
         """
         Applies trading settings for a specific asset and retrieves the updated investment settings.
@@ -769,19 +1053,19 @@ class Quotex:
             deal (float, optional): The fixed amount for each deal. Defaults to 5.
             percent_mode (bool, optional): Whether to enable percentage-based deals. Defaults to False.
             percent_deal (float, optional): The percentage value for percentage-based deals. Defaults to 1.
+            timeout (float, optional): Seconds to wait for the reply. Defaults to 10.
 
         Returns:
             dict: The updated investment settings for the specified asset.
 
-        Raises:
-            ValueError: If the investment settings cannot be retrieved after multiple attempts.
-
         Notes:
-            - This function continuously refreshes the settings until they are available.
-            - A sleep interval is used to prevent excessive API calls.
+            - The ``settings/list`` reply to the request is awaited for at
+              most ``timeout`` seconds; the last settings known are returned
+              if it does not arrive.
         """
         is_fast_option = False if time_mode.upper() == "TIMER" else True
         self.api.current_asset = asset
+        reply = self.api.events.register("settings")
         self.api.settings_apply(
             asset,
             period,
@@ -790,21 +1074,26 @@ class Quotex:
             percent_mode=percent_mode,
             percent_deal=percent_deal
         )
-        await asyncio.sleep(0.2)
-        while True:
-            self.api.refresh_settings()
-            if self.api.settings_list:
-                investments_settings = self.api.settings_list
-                break
-            await asyncio.sleep(0.2)
+        settings = await self.api.events.result("settings", reply, timeout)
+        return settings or self.api.settings_list
 
-        return investments_settings
+    def stop_candles_stream(self, asset, period=None):
+        """Release a candle stream.
+
+        Args:
+            asset (str): The asset of the stream.
+            period (int, optional): Release one reference on (asset, period);
+                when omitted every reference on the asset is released and
+                the asset is unsubscribed.
+        """
+        self.api.subscriptions.release(asset, period)
 
-    def stop_candles_stream(self, asset):
-        self.api.unsubscribe_realtime_candle(asset)
-        self.api.unfollow_candle(asset)
+    def get_subscription_stats(self):
+        """Return the stream references and the subscribe frames sent and saved."""
+        return self.api.subscriptions.stats()
 
     def start_signals_data(self):
+        self.api.subscriptions.add(SIGNALS)
         self.api.signals_subscribe()
 
     async def opening_closing_current_candle(self, asset: str, period: int = 0):
@@ -820,29 +1109,32 @@ class Quotex:
         return candles_dict
 
 
-    async def start_realtime_price(self, asset: str, period: int = 0):
-        self.start_candles_stream(asset, period)
-        while True:
-            if self.api.realtime_price.get(asset):
-                return self.api.realtime_price
-            await asyncio.sleep(0.2)
-
-    async def start_realtime_sentiment(self, asset: str, period: int = 0):
-        self.start_candles_stream(asset, period)
-        while True:
-            if self.api.realtime_sentiment.get(asset):
-                return self.api.realtime_sentiment[asset]
-            await asyncio.sleep(0.2)
+    async def start_realtime_price(self, asset: str, period: int = 0, timeout: float = 10):
+        async with self.ticks(asset) as ticks:
+            self.start_candles_stream(asset, period)
+            if not self.api.realtime_price.get(asset):
+                try:
+                    await asyncio.wait_for(ticks.get(), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("No tick of %s received within %ss.", asset, timeout)
+        return self.api.realtime_price
 
-    async def start_realtime_candle(self, asset: str, period: int = 0):
+    async def start_realtime_sentiment(self, asset: str, period: int = 0, timeout: float = 10):
         self.start_candles_stream(asset, period)
-        data = {}
-        while True:
-            print("Tá agarrado....")
-            if self.api.realtime_candles.get(asset):
-                tick = self.api.realtime_candles
-                return process_tick(tick, period, data)
-            await asyncio.sleep(0.2)
+        return await self.api.events.wait_until(
+            ("sentiment", asset), lambda: self.api.realtime_sentiment.get(asset), timeout)
+
+    async def start_realtime_candle(self, asset: str, period: int = 0, timeout: float = 10):
+        async with self.ticks(asset) as ticks:
+            self.start_candles_stream(asset, period)
+            tick = self.api.realtime_candles.get(asset)
+            if not tick:
+                try:
+                    tick = await asyncio.wait_for(ticks.get(), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("No tick of %s received within %ss.", asset, timeout)
+                    return {}
+        return process_tick(tick, period, {})
 
     async def get_realtime_candles(self, asset: str):
         """Retrieve real-time candle data for a specified asset.
@@ -861,12 +1153,95 @@ class Quotex:
     async def get_realtime_price(self, asset: str):
         return self.api.realtime_price.get(asset, {})
 
+    def ticks(self, asset: str, maxlen: int = 1024):
+        """Subscribe to the real-time ticks of an asset.
+
+        The subscription is woken only when a new tick of the asset arrives,
+        and any number of subscriptions can follow the same asset. The price
+        stream itself is started with :meth:`start_realtime_price`.
+
+        Args:
+            asset (str): The asset to follow.
+            maxlen (int): Ticks buffered before the oldest are dropped.
+
+        Returns:
+            TickSubscription: An async iterator of ticks.
+
+        Example:
+            async with client.ticks("EURUSD_otc") as ticks:
+                async for tick in ticks:
+                    print(tick.time, tick.price)
+        """
+        return self.api.tick_broker.subscribe(asset, maxlen)
+
+    def candle_builder(self, asset: str, timeframes=None, callback=None):
+        """Build the candles of several timeframes from the tick stream of an asset.
+
+        Every tick is applied once to the open candle of each timeframe;
+        closed candles are appended to :meth:`QuotexAPI.get_candle_series`
+        and passed to ``callback``, so all timeframes cost one feed. The
+        tick stream itself is started with :meth:`start_candles_stream`.
+
+        Args:
+            asset (str): The asset to follow.
+            timeframes (list): Candle periods in seconds, :attr:`size` if omitted.
+            callback (callable): Called with ``(timeframe, candle)`` when a
+                candle closes, on the websocket ingress worker.
+
+        Returns:
+            MultiTimeframeBuilder: The builder; ``close()`` stops it.
+
+        Example:
+            ```python
+            def on_close(timeframe, candle):
+                print(timeframe, candle["close"])
+
+            client.start_candles_stream("EURUSD_otc", 60)
+            builder = client.candle_builder("EURUSD_otc", [5, 60, 300], on_close)
+            ```
+        """
+        builder = MultiTimeframeBuilder(
+            asset,
+            timeframes or self.size,
+            callback,
+            store=self.api.get_candle_series
+        )
+        return self.api.tick_broker.attach(builder)
+
     def get_signal_data(self):
         return self.api.signal_data
 
     def get_profit(self):
         return self.api.profit_in_operation or 0
 
+    def get_send_queue_stats(self):
+        """Return depth, counters and latency of the outbound websocket queue."""
+        return self.api.send_queue_stats()
+
+    def get_ingress_stats(self):
+        """Return depth, high-water mark and drop counters of the inbound websocket queue."""
+        return self.api.ingress_stats()
+
+    def get_pool_stats(self):
+        """Return the assets and send-queue counters of every pooled websocket."""
+        return self.api.pool_stats()
+
+    def get_bandwidth_stats(self):
+        """Return bytes on the wire versus decoded bytes per websocket event type."""
+        return self.api.bandwidth_stats()
+
+    def get_latency_stats(self, asset=None):
+        """Return the tick lag statistics per asset.
+
+        Args:
+            asset (str, optional): The asset name; every asset when omitted.
+
+        Returns:
+            dict: ``{asset: {"server": ..., "callback": ...}}`` with count,
+            mean, max, p50 and p99 in milliseconds.
+        """
+        return self.api.latency_stats(asset)
+
     async def get_result(self, operation_id: str):
         """Check if the trade is a win based on its ID.
 
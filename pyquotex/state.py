@@ -0,0 +1,21 @@
+"""Module for Quotex per-connection state."""
+
+
+class ConnectionState(object):
+    """Class for the session and connection flags of one Quotex account.
+
+    Every :class:`QuotexAPI <pyquotex.api.QuotexAPI>` owns its own instance,
+    so any number of accounts can run in one process, on one event loop,
+    without overwriting each other's SSID or connection flags. The attribute
+    names are those of the former ``global_value`` module.
+    """
+
+    def __init__(self):
+        self.SSID = None
+        self.check_websocket_if_connect = None
+        self.started_listen_instruments = True
+        self.check_rejected_connection = False
+        self.check_accepted_connection = False
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+        self.balance_id = None
@@ -273,7 +273,7 @@ class TechnicalIndicators:
             senkou_a.append((tenkan[i] + kijun[i]) / 2)
 
         # Chikou Span (Precio de cierre desplazado 26 períodos hacia atrás)
-        chikou = lows[kijun_period:]
+        chikou = list(lows[kijun_period:])
 
         return {
             "tenkan": [round(x, 2) for x in tenkan],
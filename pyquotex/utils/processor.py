@@ -1,5 +1,10 @@
 import time
-from pyquotex.utils.services import group_by_period
+import logging
+import numpy as np
+from operator import itemgetter
+from pyquotex.utils.services import bin_by_period
+
+logger = logging.getLogger(__name__)
 
 
 def get_color(candle):
@@ -33,6 +38,110 @@ def process_tick(tick, interval, candles):
     return candles
 
 
+class MultiTimeframeBuilder(object):
+    """Build the candles of several timeframes from one tick stream.
+
+    Each tick is applied once per timeframe, like :func:`process_tick`, but
+    only the open candle of every (asset, timeframe) is kept, so a tick
+    costs O(1) per timeframe. When a tick starts a new interval the previous
+    candle is closed: it is appended to the candle series returned by
+    ``store`` and handed to ``callback(timeframe, candle)``. The series is
+    shared with the ``history/list/v2`` and ``history/load`` replies, so a
+    built candle never replaces a stored candle of the same time, and the
+    first candle of every timeframe, which started before the builder saw
+    its first tick, is only handed to the callback. Ticks older than the
+    open candle are counted in ``late`` and skipped.
+
+    :meth:`Quotex.candle_builder` attaches it to the tick broker, which
+    calls :meth:`push` from the ingress worker; callbacks must return
+    quickly.
+    """
+
+    def __init__(self, asset, timeframes, callback=None, store=None):
+        """
+        :param str asset: The asset whose ticks are pushed.
+        :param timeframes: The candle periods in seconds.
+        :param callback: Called with ``(timeframe, candle)`` on every close.
+        :param store: Called with ``(asset, timeframe)`` to get the
+            :class:`CandleSeries <pyquotex.ws.objects.candleseries.CandleSeries>`
+            closed candles are appended to.
+        """
+        self.asset = asset
+        self.timeframes = tuple(sorted(set(timeframes)))
+        self.callback = callback
+        self.store = store
+        self.broker = None
+        self.candles = {}
+        self.partial = set()
+        self.closed = 0
+        self.late = 0
+
+    def push(self, tick):
+        """Apply a tick to every timeframe.
+
+        :returns: The ``(timeframe, candle)`` pairs closed by this tick.
+        """
+        symbol, timestamp, price, direction = tick
+        closed = []
+        for interval in self.timeframes:
+            interval_start = int(timestamp // interval * interval)
+            candle = self.candles.get(interval)
+            if candle is None or interval_start > candle['timestamp']:
+                if candle is None:
+                    self.partial.add(interval)
+                else:
+                    closed.append((interval, candle))
+                self.candles[interval] = {
+                    'symbol': symbol,
+                    'open': price,
+                    'close': price,
+                    'high': price,
+                    'low': price,
+                    'timestamp': interval_start,
+                    'ticks': 1
+                }
+            elif interval_start < candle['timestamp']:
+                self.late += 1
+            else:
+                candle['close'] = price
+                if price > candle['high']:
+                    candle['high'] = price
+                elif price < candle['low']:
+                    candle['low'] = price
+                candle['ticks'] += 1
+        for interval, candle in closed:
+            self.close_candle(interval, candle)
+        return closed
+
+    def close_candle(self, interval, candle):
+        self.closed += 1
+        if interval in self.partial:
+            self.partial.discard(interval)
+        elif self.store is not None:
+            self.store(self.asset, interval).append(
+                candle['timestamp'], candle['open'], candle['close'],
+                candle['high'], candle['low'], candle['ticks'],
+                replace=False
+            )
+        if self.callback is not None:
+            try:
+                self.callback(interval, candle)
+            except Exception:
+                # A failing callback must not drop the other timeframes or
+                # the rest of the tick batch.
+                logger.exception(f"Candle callback failed for {self.asset} {interval}s.")
+
+    def close(self):
+        """Stop receiving ticks from the broker it is attached to."""
+        if self.broker is not None:
+            self.broker.unsubscribe(self)
+            self.broker = None
+
+    def current(self, timeframe):
+        """Return the open candle of a timeframe, or ``None`` before its first tick."""
+        return self.candles.get(timeframe)
+
+
 def get_last_n_candles(pair, candles, n=3):
     if pair not in candles:
         return []
@@ -119,23 +228,36 @@ def process_candles_v2(history, asset, data):
 
 
 def calculate_candles(history, period):
-    grouped = group_by_period(history, period)
-    candles = []
-    for minute, ticks in grouped.items():
-        open_price = ticks[0][1]
-        close_price = ticks[-1][1]
-        high_price = max(tick[1] for tick in ticks)
-        low_price = min(tick[1] for tick in ticks)
-        num_ticks = len(ticks)
-        candle = {
-            'time': minute * period,
-            'open': open_price,
-            'close': close_price,
-            'high': high_price,
-            'low': low_price,
-            'ticks': num_ticks
-        }
-        candles.append(candle)
+    """Aggregate ``[time, price, ...]`` ticks into candles of ``period`` seconds.
+
+    Ticks are binned with :func:`bin_by_period` and every candle is computed
+    with sorted-segment reductions (``np.maximum.reduceat`` and friends)
+    instead of a Python loop per tick. ``history`` may also be a 2-D array
+    whose first columns are time and price, which skips the extraction. The
+    last, still open, candle is left out.
+    """
+    count = len(history)
+    if not count:
+        return []
+    if isinstance(history, np.ndarray):
+        times, prices = history[:, 0], history[:, 1]
+    else:
+        times = np.fromiter(map(itemgetter(0), history), dtype=np.float64, count=count)
+        prices = np.fromiter(map(itemgetter(1), history), dtype=np.float64, count=count)
+    keys, starts, order = bin_by_period(times, period)
+    if order is not None:
+        prices = prices[order]
+    ends = np.append(starts[1:], count)
+    columns = (
+        keys.astype(np.int64) * period,
+        prices[starts],
+        prices[ends - 1],
+        np.maximum.reduceat(prices, starts),
+        np.minimum.reduceat(prices, starts),
+        ends - starts
+    )
+    fields = ('time', 'open', 'close', 'high', 'low', 'ticks')
+    candles = [dict(zip(fields, values)) for values in zip(*(column.tolist() for column in columns))]
     candles = candles[:-1]
 
     return candles
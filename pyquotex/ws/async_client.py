@@ -0,0 +1,170 @@
+"""Module for Quotex asyncio websocket."""
+import asyncio
+import logging
+from collections import deque
+from .client import WebsocketClient
+from .heartbeat import Heartbeat
+
+try:
+    from websockets.asyncio.client import connect
+    from websockets.exceptions import ConnectionClosed
+    from .deflate import MeteredDeflateFactory
+except ImportError:
+    connect = None
+    ConnectionClosed = None
+    MeteredDeflateFactory = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWebsocketClient(WebsocketClient):
+    """Class for work with Quotex API websocket on the caller's event loop.
+
+    Frames are received, queued and dispatched by tasks on the running loop,
+    so no thread is started and the handlers mutate the API state from the
+    same thread as the strategy code.
+    """
+
+    ping_interval = 24
+    reconnect_delay = 5
+
+    def __init__(self, api):
+        """
+        :param api: The instance of :class:`QuotexAPI
+            <pyquotex.api.QuotexAPI>`.
+        """
+        if connect is None:
+            raise ImportError(
+                "The asyncio transport requires the 'websockets' package: pip install websockets"
+            )
+        self.api = api
+        self.loop = asyncio.get_running_loop()
+        self.wss = None
+        self.connected = False
+        self.wire_sizes = deque()
+        self.held = [0, 0, 0]
+        self.receiver = None
+        self.closing = False
+        self.authorized = None
+        self.tasks = []
+        self.dispatcher = self.create_dispatcher()
+        self.ingress = self.create_ingress()
+        self.sender = self.create_sender()
+        self.heartbeat = self.create_heartbeat()
+        self.report = self.create_report()
+        self.ping = Heartbeat(self.keepalive, "2", interval=self.ping_interval)
+
+    async def connect(self, ssl_context=None):
+        """Open the websocket and start the receive, write and heartbeat tasks.
+
+        :param ssl_context: The :class:`ssl.SSLContext` used for the handshake.
+        """
+        self.closing = False
+        self.ssl_context = ssl_context
+        self.tasks.append(self.loop.create_task(self.sender.run()))
+        if self.owns_ingress:
+            self.tasks.append(self.loop.create_task(self.ingress.run()))
+        await self.open()
+        self.receiver = self.loop.create_task(self.run())
+        self.tasks.append(self.receiver)
+        self.tasks.append(self.loop.create_task(self.heartbeat.run()))
+        self.tasks.append(self.loop.create_task(self.ping.run()))
+        if self.owns_ingress and self.report.interval:
+            self.tasks.append(self.loop.create_task(self.report.run()))
+
+    async def open(self):
+        self.wire_sizes.clear()
+        extensions = None
+        if self.api.compression:
+            extensions = [MeteredDeflateFactory(self.wire_sizes)]
+        headers = self.handshake_headers()
+        # websockets derives Host from wss_url and appends additional
+        # headers, so Host, Origin and User-Agent go through its own options.
+        self.wss = await connect(
+            self.api.wss_url,
+            origin=headers.pop("Origin"),
+            user_agent_header=headers.pop("User-Agent"),
+            additional_headers={k: v for k, v in headers.items() if k != "Host"},
+            ssl=self.ssl_context,
+            ping_interval=self.ping_interval,
+            ping_timeout=20,
+            compression=None,
+            extensions=extensions,
+        )
+        if self.api.compression:
+            self.log_compression()
+        self.on_open(self.wss)
+
+    def log_compression(self):
+        """Log whether the server accepted permessage-deflate."""
+        extensions = self.wss.protocol.extensions
+        if extensions:
+            self.api.bandwidth.negotiated = repr(extensions[0])
+            logger.info(f"Negotiated {extensions[0]!r}.")
+        else:
+            self.api.bandwidth.negotiated = None
+            logger.info("The server declined permessage-deflate; frames are uncompressed.")
+
+    async def run(self):
+        """Receive frames until the client is closed, reconnecting on drops."""
+        while not self.closing:
+            try:
+                async for message in self.wss:
+                    self.on_message(self.wss, message)
+            except ConnectionClosed as e:
+                logger.debug(e)
+            self.on_close(self.wss, self.wss.close_code, self.wss.close_reason)
+            if self.closing:
+                break
+            await asyncio.sleep(self.reconnect_delay)
+            try:
+                await self.open()
+            except Exception as e:
+                self.on_error(self.wss, e)
+
+    async def authorize(self, ssid, timeout=10):
+        """Send the session token and wait for the server verdict.
+
+        :param str ssid: The session identifier.
+        :param timeout: Seconds to wait for ``s_authorization``.
+        :returns: ``True`` if the token was accepted.
+        """
+        self.authorized = self.loop.create_future()
+        self.api.ssid(ssid)
+        try:
+            return await asyncio.wait_for(self.authorized, timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    async def write(self, data):
+        """Write one frame to the websocket; only awaited by the writer task."""
+        await self.wss.send(data)
+
+    def on_authorization_reject(self, payload):
+        super().on_authorization_reject(payload)
+        if self.authorized is not None and not self.authorized.done():
+            self.authorized.set_result(False)
+
+    def on_authorization(self, payload):
+        super().on_authorization(payload)
+        if self.authorized is not None and not self.authorized.done():
+            self.authorized.set_result(True)
+
+    def on_pong(self, wss, pong_msg):
+        pass
+
+    def stop(self):
+        super().stop()
+        self.ping.stop()
+
+    async def close(self):
+        self.closing = True
+        self.stop()
+        for task in self.tasks:
+            task.cancel()
+        if self.wss is not None:
+            await self.wss.close()
+        self.api.state.check_websocket_if_connect = 0
+
+    def is_alive(self):
+        return self.receiver is not None and not self.receiver.done()
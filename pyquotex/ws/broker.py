@@ -0,0 +1,142 @@
+"""Module for Quotex tick subscriptions."""
+import logging
+import threading
+from collections import deque
+from .wakeup import Wakeup
+
+logger = logging.getLogger(__name__)
+
+
+class TickSubscription(object):
+    """Class for one subscriber to the ticks of an asset.
+
+    It is an async iterator woken only when a new tick of its asset arrives::
+
+        async with client.ticks("EURUSD_otc") as ticks:
+            async for tick in ticks:
+                print(tick.price)
+
+    Ticks wait in a bounded buffer; when the subscriber falls behind by more
+    than ``maxlen`` ticks the oldest ones are discarded and counted in
+    :attr:`dropped`. Settlement streams reuse it for closed deals, with
+    ``asset`` set to ``None``.
+    """
+
+    def __init__(self, broker, asset, maxlen=1024):
+        """
+        :param broker: The :class:`TickBroker` publishing the ticks.
+        :param str asset: The asset name.
+        :param int maxlen: Number of ticks buffered for a slow subscriber.
+        """
+        self.broker = broker
+        self.asset = asset
+        self.ticks = deque(maxlen=maxlen)
+        self.closed = False
+        self.received = 0
+        self.delivered = 0
+        self.wakeup = Wakeup()
+        self.wakeup.bind()
+
+    @property
+    def dropped(self):
+        """Number of ticks discarded because the subscriber fell behind."""
+        return self.received - self.delivered - len(self.ticks)
+
+    def push(self, tick):
+        self.ticks.append(tick)
+        self.received += 1
+        self.wakeup.set()
+
+    async def get(self):
+        """Wait for the next tick.
+
+        :raises StopAsyncIteration: When the subscription is closed.
+        """
+        while not self.ticks:
+            if self.closed:
+                raise StopAsyncIteration
+            await self.wakeup.wait_async()
+        self.delivered += 1
+        return self.ticks.popleft()
+
+    def close(self):
+        """Stop receiving ticks and end the iteration."""
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+            self.wakeup.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TickBroker(object):
+    """Class to fan the incoming ticks out to their subscribers.
+
+    Any number of :class:`TickSubscription` can follow the same asset.
+    :meth:`publish` is called by the websocket handlers, from the ingress
+    thread or task, and only wakes the subscribers of the tick's asset.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, asset, maxlen=1024):
+        """Create a subscription to the ticks of an asset.
+
+        Must be called from a coroutine; the subscription is woken on the
+        running event loop.
+        """
+        subscription = TickSubscription(self, asset, maxlen)
+        with self.lock:
+            subscribers = self.subscribers.get(asset, ())
+            self.subscribers[asset] = subscribers + (subscription,)
+        return subscription
+
+    def attach(self, consumer):
+        """Hand the ticks of ``consumer.asset`` to ``consumer.push``.
+
+        Used by consumers that need no wakeup, e.g. a
+        :class:`MultiTimeframeBuilder <pyquotex.utils.processor.MultiTimeframeBuilder>`;
+        :meth:`push` runs on the ingress worker. The consumer's ``close()``
+        detaches it.
+        """
+        consumer.broker = self
+        with self.lock:
+            subscribers = self.subscribers.get(consumer.asset, ())
+            self.subscribers[consumer.asset] = subscribers + (consumer,)
+        return consumer
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = tuple(
+                s for s in self.subscribers.get(subscription.asset, ()) if s is not subscription
+            )
+            if subscribers:
+                self.subscribers[subscription.asset] = subscribers
+            else:
+                self.subscribers.pop(subscription.asset, None)
+
+    def publish(self, tick):
+        """Hand a :class:`Tick <pyquotex.ws.objects.tick.Tick>` to every subscriber of its asset."""
+        for subscription in self.subscribers.get(tick.symbol, ()):
+            try:
+                subscription.push(tick)
+            except Exception:
+                logger.exception(f"Tick subscriber of {tick.symbol} failed.")
+
+    def close(self):
+        """End every subscription, e.g. when the client disconnects for good."""
+        for subscribers in list(self.subscribers.values()):
+            for subscription in subscribers:
+                subscription.close()
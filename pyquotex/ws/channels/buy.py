@@ -9,7 +9,12 @@ class Buy(Base):
 
     name = "buy"
 
-    def __call__(self, price, asset, direction, duration, request_id, is_fast_option):
+    def __call__(self, price, asset, direction, duration, request_id, is_fast_option, tick=True):
+        """Method to send the frames of one order.
+
+        :param tick: Send the ``tick`` frame first; batched orders send it
+            once for the whole batch.
+        """
         option_type = 1
 
         expiration_time = get_expiration_time_quotex(
@@ -44,8 +49,9 @@ class Buy(Base):
             "optionType": option_type
         }
 
-        data = f'42["tick"]'
-        self.send_websocket_request(data)
+        if tick:
+            data = f'42["tick"]'
+            self.send_websocket_request(data)
 
         data = f'42["orders/open",{json.dumps(payload)}]'
         print(data)
@@ -10,15 +10,14 @@ class SellOption(Base):
     def __call__(self, options_ids):
         """
         :param options_ids: list or int
+
+        Every cancel frame is queued at once, so the writer sends them
+        back-to-back.
         """
         if type(options_ids) != list:
+            options_ids = [options_ids]
+        for ids in options_ids:
             payload = {
-                "ticket": options_ids
+                "ticket": ids
             }
             self.send_websocket_request(f'42["orders/cancel",{json.dumps(payload)}]')
-        else:
-            for ids in options_ids:
-                payload = {
-                    "ticket": ids
-                }
-                self.send_websocket_request(f'42["orders/cancel",{json.dumps(payload)}]')
@@ -12,10 +12,13 @@ class Ssid(Base):
 
         :param ssid: The session identifier.
         """
+        self.send_websocket_request(self.frame(ssid))
+
+    def frame(self, ssid):
+        """Return the ``authorization`` frame for the session identifier."""
         payload = {
             "session": ssid,
             "isDemo": self.api.account_type,
             "tournamentId": 0
         }
-        data = f'42["authorization",{json.dumps(payload)}]'
-        self.send_websocket_request(data)
+        return f'42["authorization",{json.dumps(payload)}]'
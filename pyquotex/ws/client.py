@@ -1,9 +1,14 @@
 """Module for Quotex websocket."""
-import json
 import time
 import logging
 import websocket
-from .. import global_value
+from collections import deque
+from .dispatcher import EventDispatcher, CONNECT, DISCONNECT
+from .sender import SendQueue
+from .heartbeat import Heartbeat
+from .ingress import IngressQueue, TICKS, SENTIMENT, EVENTS
+from .codec import Decoder
+from .objects.tick import Tick
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +16,8 @@ logger = logging.getLogger(__name__)
 class WebsocketClient(object):
     """Class for work with Quotex API websocket."""
 
+    owns_ingress = True
+
     def __init__(self, api):
         """
         :param api: The instance of :class:`QuotexAPI
@@ -18,11 +25,15 @@ class WebsocketClient(object):
         trace_ws: Enables and disable `enableTrace` in WebSocket Client.
         """
         self.api = api
-        self.headers = {
-            "User-Agent": self.api.session_data.get("user_agent"),
-            "Origin": self.api.https_url,
-            "Host": f"ws2.{self.api.host}",
-        }
+        self.connected = False
+        self.wire_sizes = deque()
+        self.held = [0, 0, 0]
+        if self.api.compression and self.owns_ingress:
+            logger.warning(
+                "websocket-client does not implement permessage-deflate; frames are "
+                "received uncompressed. Use transport='asyncio' for compression."
+            )
+        self.headers = self.handshake_headers()
 
         websocket.enableTrace(self.api.trace_ws)
         self.wss = websocket.WebSocketApp(
@@ -34,156 +45,328 @@ class WebsocketClient(object):
             on_ping=self.on_ping,
             on_pong=self.on_pong,
             header=self.headers,
-            # cookie=self.api.cookies
         )
+        self.dispatcher = self.create_dispatcher()
+        self.ingress = self.create_ingress()
+        if self.owns_ingress:
+            self.ingress.start()
+        self.sender = self.create_sender()
+        self.sender.start()
+        self.heartbeat = self.create_heartbeat()
+        self.heartbeat.start()
+        self.report = self.create_report()
+        if self.owns_ingress and self.report.interval:
+            self.report.start()
+
+    def handshake_headers(self):
+        """Return the HTTP headers of the websocket handshake, for both transports."""
+        headers = {
+            "User-Agent": self.api.session_data.get("user_agent"),
+            "Origin": self.api.https_url,
+            "Host": f"ws2.{self.api.host}",
+        }
+        cookies = self.api.session_data.get("cookies")
+        if cookies:
+            headers["Cookie"] = cookies
+        return headers
+
+    def create_sender(self):
+        coalesce = self.api.coalesce_events if self.api.coalesce_writes else ()
+        return SendQueue(self.write, coalesce=coalesce, unsafe=self.api.unsafe_events)
+
+    def create_ingress(self):
+        return IngressQueue(
+            self.process,
+            capacity=self.api.ingress_capacity,
+            coalesce_limit=self.api.ingress_coalesce_limit,
+            policies=self.api.ingress_policies,
+            observe=self.observe
+        )
+
+    def create_report(self):
+        return Heartbeat(self.api.latency.report, None, interval=self.api.latency_report_interval)
+
+    def create_heartbeat(self):
+        return Heartbeat(
+            self.keepalive,
+            '42["tick"]',
+            interval=self.api.heartbeat_interval,
+            jitter=self.api.heartbeat_jitter
+        )
+
+    def create_dispatcher(self):
+        """Build the event table shared by every websocket transport."""
+        dispatcher = EventDispatcher(
+            default=self.on_data,
+            decoder=Decoder(self.api.json_backend)
+        )
+        dispatcher.register("authorization/reject", self.on_authorization_reject)
+        dispatcher.register("s_authorization", self.on_authorization)
+        dispatcher.register("instruments/list", self.on_instruments)
+        dispatcher.register("settings/list", self.on_settings)
+        dispatcher.register("history/list/v2", self.on_history)
+        dispatcher.register(CONNECT, self.on_connect)
+        dispatcher.register(DISCONNECT, self.on_disconnect)
+        return dispatcher
+
+    def send(self, data, urgent=False):
+        """Enqueue one frame for the writer without blocking.
+
+        :param str data: The websocket frame.
+        :param bool urgent: Put the frame ahead of already queued frames.
+        """
+        self.sender.put(data, urgent)
+
+    def keepalive(self, data):
+        """Send a heartbeat frame, skipping beats while disconnected."""
+        if self.connected:
+            self.send(data)
+
+    def write(self, data):
+        """Write one frame to the websocket; only called by the writer."""
+        self.wss.send(data)
 
     def on_message(self, wss, message):
-        """Method to process websocket messages."""
-        global_value.ssl_Mutual_exclusion = True
-        current_time = time.localtime()
-        if current_time.tm_sec in [0, 5, 10, 15, 20, 30, 40, 50]:
-            self.wss.send('42["tick"]')
+        """Method to process websocket messages.
+
+        The receiver only decodes the frame and queues its payload by
+        channel; the handlers run on the ingress worker.
+        """
+        stamp = time.monotonic_ns()
+        held = self.held
+        held[0] += 1
+        held[1] += self.wire_sizes.popleft() if self.wire_sizes else len(message)
+        held[2] += len(message)
         try:
-            if "authorization/reject" in str(message):
-                print("Token rejected, making automatic reconnection.")
-                logger.debug("Token rejected, making automatic reconnection.")
-                global_value.check_rejected_connection = 1
-            elif "s_authorization" in str(message):
-                global_value.check_accepted_connection = 1
-                global_value.check_rejected_connection = 0
-            elif "instruments/list" in str(message):
-                global_value.started_listen_instruments = True
-
-            try:
-                message = message[1:].decode()
-                logger.debug(message)
-                message = json.loads(message)
-                self.api.wss_message = message
-                if "call" in str(message) or 'put' in str(message):
-                    self.api.instruments = message
-                if isinstance(message, dict):
-                    if message.get("signals"):
-                        time_in = message.get("time")
-                        for i in message["signals"]:
-                            try:
-                                self.api.signal_data[i[0]] = {}
-                                self.api.signal_data[i[0]][i[2]] = {}
-                                self.api.signal_data[i[0]][i[2]]["dir"] = i[1][0]["signal"]
-                                self.api.signal_data[i[0]][i[2]]["duration"] = i[1][0]["timeFrame"]
-                            except:
-                                self.api.signal_data[i[0]] = {}
-                                self.api.signal_data[i[0]][time_in] = {}
-                                self.api.signal_data[i[0]][time_in]["dir"] = i[1][0][1]
-                                self.api.signal_data[i[0]][time_in]["duration"] = i[1][0][0]
-                    elif message.get("liveBalance") or message.get("demoBalance"):
-                        self.api.account_balance = message
-                    elif message.get("position"):
-                        self.api.top_list_leader = message
-                    elif len(message) == 1 and message.get("profit", -1) > -1:
-                        self.api.profit_today = message
-                    elif message.get("index"):
-                        self.api.historical_candles = message
-                        self.api.timesync.server_timestamp = message.get("closeTimestamp")
-                    if message.get("pending"):
-                        self.api.pending_successful = message
-                        self.api.pending_id = message["pending"]["ticket"]
-                    elif message.get("id") and not message.get("ticket"):
-                        self.api.buy_successful = message
-                        self.api.buy_id = message["id"]
-                        self.api.timesync.server_timestamp = message.get("closeTimestamp")
-                    elif message.get("ticket") and not message.get("id"):
-                        self.api.sold_options_respond = message
-                    elif message.get("deals"):
-                        for get_m in message["deals"]:
-                            self.api.profit_in_operation = get_m["profit"]
-                            get_m["win"] = True if message["profit"] > 0 else False
-                            get_m["game_state"] = 1
-                            self.api.listinfodata.set(
-                                get_m["win"],
-                                get_m["game_state"],
-                                get_m["id"]
-                            )
-                    elif message.get("isDemo") and message.get("balance"):
-                        self.api.training_balance_edit_request = message
-                    elif message.get("error"):
-                        global_value.websocket_error_reason = message.get("error")
-                        global_value.check_websocket_if_error = True
-                        if global_value.websocket_error_reason == "not_money":
-                            self.api.account_balance = {"liveBalance": 0}
-                    elif not message.get("list") == []:
-                        self.api.wss_message = message
-            except:
-                pass
-
-            if str(message) == "41":
-                logger.info("Disconnection event triggered by the platform, causing automatic reconnection.")
-                global_value.check_websocket_if_connect = 0
-            if "51-" in str(message):
-                self.api._temp_status = str(message)
-            elif self.api._temp_status == """451-["settings/list",{"_placeholder":true,"num":0}]""":
-                self.api.settings_list = message
-                self.api._temp_status = ""
-            elif self.api._temp_status == """451-["history/list/v2",{"_placeholder":true,"num":0}]""":
-                if message.get("asset") == self.api.current_asset:
-                    self.api.candles.candles_data = message["history"]
-                    self.api.candle_v2_data[message["asset"]] = message
-                    self.api.candle_v2_data[message["asset"]]["candles"] = [{
-                        "time": candle[0],
-                        "open": candle[1],
-                        "close": candle[2],
-                        "high": candle[3],
-                        "low": candle[4],
-                        "ticks": candle[5]
-                    } for candle in message["candles"]]
-            elif len(message[0]) == 4:
-                result = {
-                    "time": message[0][1],
-                    "price": message[0][2]
+            event, payload = self.dispatcher.decode(message)
+            if event is None and payload is None:
+                if self.dispatcher.parser.reconstructing is None:
+                    self.account("engine.io")
+                return
+            if event not in self.dispatcher.handlers and isinstance(payload, list) \
+                    and payload and isinstance(payload[0], list):
+                size = len(payload[0])
+                if size == 4:
+                    self.account(event or TICKS)
+                    latency = self.api.latency
+                    for row in payload:
+                        latency.arrived(row[0], row[1], stamp)
+                        self.ingress.put(TICKS, event, [row], key=row[0], stamp=stamp)
+                    return
+                if size == 2:
+                    self.account(event or SENTIMENT)
+                    for row in payload:
+                        self.ingress.put(SENTIMENT, event, [row], key=row[0], stamp=stamp)
+                    return
+            self.account(event or EVENTS)
+            self.forward(event, payload, stamp)
+        except Exception:
+            self.account("undecodable")
+            logger.debug("Failed to decode websocket message.", exc_info=True)
+
+    def forward(self, event, payload, stamp):
+        """Queue the payload of a decoded event for the ingress worker."""
+        self.ingress.put(EVENTS, event, payload, stamp=stamp)
+
+    def account(self, event):
+        """Charge the frames received since the last complete packet to an event."""
+        held = self.held
+        self.api.bandwidth.record(event, held[1], held[2], held[0])
+        held[0] = held[1] = held[2] = 0
+
+    def observe(self, channel, key, lag):
+        """Record the receive-to-callback lag of the ticks of an asset."""
+        if channel == TICKS:
+            self.api.latency.delivered(key, lag)
+
+    def process(self, event, payload):
+        """Run the handler of one payload taken from the ingress queue."""
+        if payload is not None:
+            logger.debug(payload)
+            self.api.wss_message = payload
+        self.dispatcher.handle(event, payload)
+
+    def on_authorization_reject(self, payload):
+        print("Token rejected, making automatic reconnection.")
+        logger.debug("Token rejected, making automatic reconnection.")
+        self.api.state.check_rejected_connection = 1
+
+    def on_authorization(self, payload):
+        self.api.state.check_accepted_connection = 1
+        self.api.state.check_rejected_connection = 0
+
+    def on_instruments(self, payload):
+        self.api.state.started_listen_instruments = True
+        if payload is not None:
+            self.api.instruments = payload
+            self.api.events.notify("instruments", payload)
+
+    def on_settings(self, payload):
+        self.api.settings_list = payload
+        self.api.events.notify("settings", payload)
+
+    def on_history(self, payload):
+        asset = payload.get("asset")
+        if asset == self.api.current_asset:
+            self.api.candles.candles_data = payload["history"]
+        self.api.candle_v2_data[asset] = payload
+        self.api.get_candle_series(asset, payload.get("period")).merge(payload["candles"])
+        self.api.subscriptions.merge_ticks(asset, payload.get("history"))
+        self.api.history_replies.resolve((asset, payload.get("period")), payload)
+
+    def on_connect(self, payload):
+        self.api.subscriptions.on_connect()
+
+    def on_disconnect(self, payload):
+        logger.info("Disconnection event triggered by the platform, causing automatic reconnection.")
+        self.api.state.check_websocket_if_connect = 0
+        self.api.subscriptions.disconnected()
+        # Rejoin the socket.io namespace; the streams are replayed on connect.
+        self.send("40")
+
+    def on_data(self, event, payload):
+        """Route payloads of events without a dedicated handler by shape."""
+        if isinstance(payload, dict):
+            self.on_dict(payload)
+        elif isinstance(payload, list) and payload and isinstance(payload[0], list):
+            size = len(payload[0])
+            if size == 4:
+                self.on_ticks(payload)
+            elif size == 2:
+                self.on_sentiment(payload)
+
+    def on_ticks(self, payload):
+        tick = None
+        subscribers = self.api.tick_broker.subscribers
+        for row in payload:
+            tick = Tick.from_row(row)
+            prices = self.api.realtime_price.get(tick.symbol)
+            if prices is not None:
+                prices.append(tick)
+            if tick.symbol in subscribers:
+                self.api.tick_broker.publish(tick)
+        self.api.realtime_candles[self.api.current_asset] = tick
+
+    def on_sentiment(self, payload):
+        for i in payload:
+            result = {
+                "sentiment": {
+                    "sell": 100 - int(i[1]),
+                    "buy": int(i[1])
                 }
-                self.api.realtime_price[message[0][0]].append(result)
-                self.api.realtime_candles[self.api.current_asset] = message[0]
-                #print(self.api.realtime_candles)
-            elif len(message[0]) == 2:
-                for i in message:
-                    result = {
-                        "sentiment": {
-                            "sell": 100 - int(i[1]),
-                            "buy": int(i[1])
-                        }
-                    }
-                    self.api.realtime_sentiment[i[0]] = result
-        except:
-            pass
-        global_value.ssl_Mutual_exclusion = False
+            }
+            self.api.realtime_sentiment[i[0]] = result
+            self.api.events.notify(("sentiment", i[0]), result)
+
+    def on_dict(self, message):
+        if message.get("signals"):
+            time_in = message.get("time")
+            for i in message["signals"]:
+                try:
+                    self.api.signal_data[i[0]] = {}
+                    self.api.signal_data[i[0]][i[2]] = {}
+                    self.api.signal_data[i[0]][i[2]]["dir"] = i[1][0]["signal"]
+                    self.api.signal_data[i[0]][i[2]]["duration"] = i[1][0]["timeFrame"]
+                except:
+                    self.api.signal_data[i[0]] = {}
+                    self.api.signal_data[i[0]][time_in] = {}
+                    self.api.signal_data[i[0]][time_in]["dir"] = i[1][0][1]
+                    self.api.signal_data[i[0]][time_in]["duration"] = i[1][0][0]
+        elif message.get("liveBalance") or message.get("demoBalance"):
+            self.api.account_balance = message
+            self.api.events.notify("balance", message)
+        elif message.get("position"):
+            self.api.top_list_leader = message
+        elif len(message) == 1 and message.get("profit", -1) > -1:
+            self.api.profit_today = message
+        elif message.get("index"):
+            self.api.historical_candles = message
+            self.api.subscriptions.merge_candles(message.get("index"), message.get("data"))
+            self.api.history_replies.resolve(message.get("index"), message)
+            self.api.timesync.server_timestamp = message.get("closeTimestamp")
+        if message.get("pending"):
+            self.api.pending_successful = message
+            self.api.pending_orders.on_created(message)
+            if isinstance(message["pending"], dict):
+                self.api.pending_id = message["pending"]["ticket"]
+        elif message.get("id") and message.get("ticket"):
+            self.api.pending_orders.on_opened(message)
+        elif message.get("id") and not message.get("ticket"):
+            self.api.buy_successful = message
+            self.api.buy_id = message["id"]
+            self.api.order_replies.resolve(message.get("requestId"), message)
+            self.api.timesync.server_timestamp = message.get("closeTimestamp")
+        elif message.get("ticket") and not message.get("id"):
+            self.api.sold_options_respond = message
+            self.api.pending_orders.on_cancelled(message.get("ticket"))
+            self.api.cancel_replies.resolve(message.get("ticket"), message)
+        elif message.get("deals"):
+            self.api.settlements.settle(message)
+            for deal in message["deals"]:
+                self.api.subscriptions.settled(deal.get("id"))
+        elif message.get("isDemo") and message.get("balance"):
+            self.api.training_balance_edit_request = message
+            self.api.events.notify("training_balance", message)
+        elif message.get("error"):
+            self.api.state.websocket_error_reason = message.get("error")
+            self.api.state.check_websocket_if_error = True
+            if not self.api.order_replies.resolve(message.get("requestId"), message):
+                # Without a requestId the error is only pinned on a request
+                # when it is the one in flight; other waiters time out.
+                waiting = [
+                    replies for replies in (
+                        self.api.order_replies,
+                        self.api.pending_orders.created,
+                        self.api.cancel_replies
+                    ) if replies.futures
+                ]
+                if len(waiting) == 1:
+                    waiting[0].resolve_single(message)
+            if self.api.state.websocket_error_reason == "not_money":
+                self.api.account_balance = {"liveBalance": 0}
+                self.api.events.notify("balance", self.api.account_balance)
 
     def on_error(self, wss, error):
         """Method to process websocket errors."""
         logger.error(error)
-        global_value.websocket_error_reason = str(error)
-        global_value.check_websocket_if_error = True
+        self.api.state.websocket_error_reason = str(error)
+        self.api.state.check_websocket_if_error = True
 
     def on_open(self, wss):
         """Method to process websocket open."""
         logger.info("Websocket client connected.")
-        global_value.check_websocket_if_connect = 1
+        self.api.state.check_websocket_if_connect = 1
+        self.connected = True
+        self.sender.resume()
         asset_name = self.api.current_asset
         period = self.api.current_period
-        self.wss.send('42["tick"]')
-        self.wss.send('42["indicator/list"]')
-        self.wss.send('42["drawing/load"]')
-        self.wss.send('42["pending/list"]')
-        self.wss.send('42["instruments/update",{"asset":"%s","period":%d}]' % (asset_name, period))
-        self.wss.send('42["depth/follow","%s"]' % asset_name)
-        self.wss.send('42["chart_notification/get"]')
-        self.wss.send('42["tick"]')
+        self.send('42["tick"]')
+        self.send('42["indicator/list"]')
+        self.send('42["drawing/load"]')
+        self.send('42["pending/list"]')
+        self.send('42["instruments/update",{"asset":"%s","period":%d}]' % (asset_name, period))
+        self.send('42["depth/follow","%s"]' % asset_name)
+        self.send('42["chart_notification/get"]')
+        self.send('42["tick"]')
 
     def on_close(self, wss, close_status_code, close_msg):
         """Method to process websocket close."""
         logger.info("Websocket connection closed.")
-        global_value.check_websocket_if_connect = 0
+        self.api.state.check_websocket_if_connect = 0
+        self.connected = False
+        self.sender.pause()
+        self.api.subscriptions.disconnected()
+
+    def stop(self):
+        """Stop the writer, the ingress worker, the heartbeat and the latency report."""
+        self.heartbeat.stop()
+        self.report.stop()
+        self.sender.stop()
+        if self.owns_ingress:
+            self.ingress.stop()
 
     def on_ping(self, wss, ping_msg):
         pass
 
     def on_pong(self, wss, pong_msg):
-        self.wss.send("2")
+        self.send("2")
@@ -0,0 +1,57 @@
+"""Module for Quotex websocket JSON decoding.
+
+orjson or msgspec are used when installed, with the standard library as the
+fallback. Binary socket.io attachments are decoded from a ``memoryview`` so
+the Engine.IO type byte is skipped without copying the frame when the
+backend supports it.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def available_backends():
+    """Return the names of the installed JSON backends, fastest first."""
+    installed = {"orjson": orjson, "msgspec": msgspec, "json": json}
+    return [name for name in BACKENDS if installed[name] is not None]
+
+
+def default_backend():
+    return available_backends()[0]
+
+
+class Decoder(object):
+    """Class for decoding socket.io frames with a pluggable JSON backend."""
+
+    def __init__(self, backend=None):
+        """
+        :param str backend: ``"orjson"``, ``"msgspec"`` or ``"json"``; the
+            fastest installed backend is used when ``None``.
+        """
+        self.backend = backend or default_backend()
+        if self.backend not in available_backends():
+            raise ValueError(
+                f"JSON backend '{self.backend}' is not installed. Available: {available_backends()}"
+            )
+        if self.backend == "orjson":
+            self.loads = orjson.loads
+        elif self.backend == "msgspec":
+            self.loads = msgspec.json.Decoder().decode
+        else:
+            self.loads = json.loads
+
+    def decode_binary(self, message):
+        """Decode a binary frame, skipping its Engine.IO type byte."""
+        if self.backend == "json":
+            return self.loads(message[1:])
+        return self.loads(memoryview(message)[1:])
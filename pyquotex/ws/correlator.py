@@ -0,0 +1,148 @@
+"""Module for Quotex websocket request/reply correlation."""
+import time
+import asyncio
+import itertools
+import threading
+
+
+class ReplyCorrelator(object):
+    """Class matching websocket replies to the requests awaiting them.
+
+    Every request registers a future under its key, e.g. the ``requestId``
+    of an order, and the handler of the reply resolves the futures waiting
+    on that exact key, so any number of requests can be in flight at once.
+    Replies are handled on the ingress worker; futures of another thread's
+    loop are resolved through
+    :meth:`asyncio.AbstractEventLoop.call_soon_threadsafe`.
+
+    It also bridges plain events, e.g. a balance update: the handler calls
+    :meth:`notify` and the coroutines in :meth:`wait_until` wake at once
+    instead of polling the attribute the handler sets.
+    """
+
+    def __init__(self):
+        self.futures = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(int(time.time() * 1000))
+        self.resolved = 0
+        self.unmatched = 0
+
+    def next_id(self):
+        """Return a request id unique to this session."""
+        return next(self.ids)
+
+    def register(self, key):
+        """Create the future resolved by the reply to ``key``.
+
+        Must be called from a coroutine; the future belongs to the running
+        event loop.
+        """
+        future = asyncio.get_running_loop().create_future()
+        with self.lock:
+            self.futures.setdefault(key, []).append(future)
+        return future
+
+    def discard(self, key, future):
+        """Forget a future whose caller stopped waiting, e.g. on timeout."""
+        with self.lock:
+            futures = self.futures.get(key)
+            if futures and future in futures:
+                futures.remove(future)
+                if not futures:
+                    del self.futures[key]
+
+    def resolve(self, key, reply):
+        """Resolve the futures of ``key`` with the reply.
+
+        :returns: ``True`` if a request was waiting for it.
+        """
+        with self.lock:
+            futures = self.futures.pop(key, None)
+        if not futures:
+            self.unmatched += 1
+            return False
+        self.resolved += len(futures)
+        for future in futures:
+            self.complete(future, reply)
+        return True
+
+    def notify(self, key, value=None):
+        """Wake the waiters of an event; cheap when nobody waits."""
+        if key not in self.futures:
+            return False
+        with self.lock:
+            futures = self.futures.pop(key, None)
+        for future in futures or ():
+            self.complete(future, value)
+        return bool(futures)
+
+    async def result(self, key, future, timeout=None, default=None):
+        """Await a registered future for at most ``timeout`` seconds.
+
+        :returns: The reply, or ``default`` on timeout.
+        """
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.discard(key, future)
+            return default
+
+    async def wait_until(self, key, ready, timeout=None):
+        """Wait until ``ready()`` returns a value, re-checking it when ``key`` is notified.
+
+        :param ready: Callable returning the awaited value, or ``None``.
+        :param timeout: Seconds to wait; ``None`` waits forever.
+        :returns: The value of ``ready()``, ``None`` on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            future = self.register(key)
+            value = ready()
+            if value is not None:
+                self.discard(key, future)
+                return value
+            remaining = None if deadline is None else max(deadline - loop.time(), 0)
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                self.discard(key, future)
+                return ready()
+
+    def resolve_single(self, reply):
+        """Resolve the only waiting request, for replies that carry no key.
+
+        :returns: ``False`` if no request or several requests are waiting,
+            since the reply could then belong to any of them.
+        """
+        with self.lock:
+            if len(self.futures) != 1:
+                return False
+            key = next(iter(self.futures))
+        return self.resolve(key, reply)
+
+    @staticmethod
+    def complete(future, reply):
+        loop = future.get_loop()
+        if loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            ReplyCorrelator.settle(future, reply)
+        else:
+            loop.call_soon_threadsafe(ReplyCorrelator.settle, future, reply)
+
+    @staticmethod
+    def settle(future, reply):
+        if not future.done():
+            future.set_result(reply)
+
+    def stats(self):
+        return {
+            "waiting": sum(len(futures) for futures in self.futures.values()),
+            "resolved": self.resolved,
+            "unmatched": self.unmatched,
+        }
@@ -0,0 +1,55 @@
+"""Module for Quotex permessage-deflate with wire-size accounting."""
+from websockets.frames import CTRL_OPCODES
+from websockets.extensions.permessage_deflate import (
+    ClientPerMessageDeflateFactory,
+    PerMessageDeflate,
+)
+
+
+class MeteredDeflate(PerMessageDeflate):
+    """Permessage-deflate extension reporting the compressed size of every message.
+
+    The size of each data message before decompression is appended to
+    ``sizes``; the receiver pops it when the decoded message arrives, since
+    messages leave the extension in the order they are delivered.
+    """
+
+    def __init__(self, sizes, extension):
+        """
+        :param sizes: The :class:`collections.deque` receiving the sizes.
+        :param extension: The :class:`PerMessageDeflate` negotiated by the
+            factory, whose parameters are reused.
+        """
+        super().__init__(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+        )
+        self.sizes = sizes
+        self.partial = 0
+
+    def decode(self, frame, *, max_size=None):
+        if frame.opcode not in CTRL_OPCODES:
+            self.partial += len(frame.data)
+            if frame.fin:
+                self.sizes.append(self.partial)
+                self.partial = 0
+        return super().decode(frame, max_size=max_size)
+
+
+class MeteredDeflateFactory(ClientPerMessageDeflateFactory):
+    """Client factory offering permessage-deflate and building :class:`MeteredDeflate`."""
+
+    def __init__(self, sizes, **kwargs):
+        """
+        :param sizes: The :class:`collections.deque` receiving the wire sizes.
+        """
+        kwargs.setdefault("compress_settings", {"memLevel": 5})
+        super().__init__(**kwargs)
+        self.sizes = sizes
+
+    def process_response_params(self, params, accepted_extensions):
+        extension = super().process_response_params(params, accepted_extensions)
+        return MeteredDeflate(self.sizes, extension)
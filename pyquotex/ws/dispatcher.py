@@ -0,0 +1,78 @@
+"""Module for Quotex websocket event dispatcher."""
+import logging
+from . import packet as sio
+from .codec import Decoder
+from .packet import PacketDecoder
+
+logger = logging.getLogger(__name__)
+
+CONNECT = "connect"
+DISCONNECT = "disconnect"
+
+
+class EventDispatcher(object):
+    """Class to route socket.io frames to registered event handlers.
+
+    Every frame is decoded exactly once, its socket.io event name is resolved
+    once and the payload is handed to the handler registered for that event
+    through a single dict lookup. Frames whose event has no handler go to the
+    ``default`` handler.
+    """
+
+    def __init__(self, default=None, decoder=None):
+        """
+        :param default: Handler called with ``(event, payload)`` for events
+            that have no registered handler.
+        :param decoder: The :class:`Decoder <pyquotex.ws.codec.Decoder>`
+            used for JSON payloads.
+        """
+        self.handlers = {}
+        self.default = default
+        self.decoder = decoder or Decoder()
+        self.parser = PacketDecoder(self.decoder)
+
+    def register(self, event, handler):
+        """Register the handler for a socket.io event.
+
+        :param str event: The event name, e.g. ``"history/list/v2"``.
+        :param handler: Callable receiving the decoded payload.
+        """
+        self.handlers[event] = handler
+
+    def decode(self, message):
+        """Decode one websocket frame.
+
+        Frames are fed to the socket.io :class:`PacketDecoder
+        <pyquotex.ws.packet.PacketDecoder>`, which pairs every ``451-``
+        header with its binary attachments before the packet is dispatched.
+
+        :param message: The raw websocket frame (``str`` or ``bytes``).
+        :returns: A tuple ``(event, payload)``; both are ``None`` when the
+            frame completes nothing to dispatch.
+        """
+        packet = self.parser.feed(message)
+        if packet is None:
+            return None, None
+        if packet.type == sio.CONNECT:
+            return CONNECT, None
+        if packet.type == sio.DISCONNECT:
+            return DISCONNECT, None
+        return packet.event, packet.payload
+
+    def dispatch(self, message):
+        """Decode a frame and call the handler registered for its event.
+
+        :param message: The raw websocket frame (``str`` or ``bytes``).
+        :returns: The decoded payload, or ``None`` for control frames.
+        """
+        event, payload = self.decode(message)
+        self.handle(event, payload)
+        return payload
+
+    def handle(self, event, payload):
+        """Call the handler registered for a decoded event."""
+        handler = self.handlers.get(event)
+        if handler is not None:
+            handler(payload)
+        elif self.default is not None and (event is not None or payload is not None):
+            self.default(event, payload)
@@ -0,0 +1,52 @@
+"""Module for Quotex websocket heartbeat."""
+import random
+import asyncio
+import threading
+
+
+class Heartbeat(object):
+    """Class for a keepalive sent on a timer, independent of inbound traffic.
+
+    Exactly one frame is sent per interval. A random jitter spreads the
+    beats of many connections so they do not hit the server together.
+    """
+
+    def __init__(self, send, payload='42["tick"]', interval=5, jitter=0.0):
+        """
+        :param send: Callable that sends one frame.
+        :param str payload: The keepalive frame.
+        :param float interval: Seconds between two beats.
+        :param float jitter: Maximum random deviation, in seconds, per beat.
+        """
+        self.send = send
+        self.payload = payload
+        self.interval = interval
+        self.jitter = jitter
+        self.stopped = threading.Event()
+
+    def delay(self):
+        if not self.jitter:
+            return self.interval
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def start(self):
+        """Run the heartbeat in a daemon thread."""
+        self.stopped.clear()
+        thread = threading.Thread(target=self.run_forever)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def run_forever(self):
+        while not self.stopped.wait(self.delay()):
+            self.send(self.payload)
+
+    async def run(self):
+        """Run the heartbeat as a task on the current event loop."""
+        while not self.stopped.is_set():
+            await asyncio.sleep(self.delay())
+            if not self.stopped.is_set():
+                self.send(self.payload)
+
+    def stop(self):
+        self.stopped.set()
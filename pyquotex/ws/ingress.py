@@ -0,0 +1,180 @@
+"""Module for Quotex websocket inbound queue."""
+import time
+import logging
+import threading
+from collections import deque
+from .wakeup import Wakeup
+
+logger = logging.getLogger(__name__)
+
+# Channels of inbound payloads.
+TICKS = "ticks"
+SENTIMENT = "sentiment"
+EVENTS = "events"
+
+# Policies applied per channel.
+KEEP = "keep"
+LATEST = "latest"
+COALESCE = "coalesce"
+DROP = "drop"
+
+DEFAULT_POLICIES = {
+    TICKS: COALESCE,
+    SENTIMENT: LATEST,
+    EVENTS: KEEP,
+}
+
+
+class IngressQueue(object):
+    """Class for the bounded queue between the websocket receiver and the handlers.
+
+    The receiver only decodes frames and puts their payloads here; one worker
+    (a daemon thread for the thread transport, a task for the asyncio
+    transport) drains the queue and runs the handlers. Each channel has a
+    policy deciding what happens while its entries wait:
+
+    * ``keep``: every entry is queued, even beyond ``capacity``.
+    * ``latest``: one pending entry per key, replaced by newer payloads.
+    * ``coalesce``: one pending entry per key; newer rows are appended to
+      it, keeping the newest ``coalesce_limit`` rows. Older rows are counted
+      in ``dropped``.
+    * ``drop``: entries are queued while there is room and dropped otherwise.
+
+    New keys of ``latest`` and ``coalesce`` channels are dropped as well when
+    the queue is full.
+    """
+
+    def __init__(self, handle, capacity=4096, policies=None, observe=None, coalesce_limit=1024):
+        """
+        :param handle: Callable receiving ``(event, payload)`` of every
+            drained entry.
+        :param int capacity: Number of entries the queue holds before
+            droppable entries are discarded.
+        :param dict policies: Policy per channel, merged over
+            :data:`DEFAULT_POLICIES`.
+        :param observe: Callable receiving ``(channel, key, lag)`` before the
+            handler of a stamped entry runs, ``lag`` being the nanoseconds
+            since the entry was received.
+        :param int coalesce_limit: Rows one coalesced entry holds at most.
+        """
+        self.handle = handle
+        self.observe = observe
+        self.capacity = capacity
+        self.coalesce_limit = coalesce_limit
+        self.policies = dict(DEFAULT_POLICIES, **(policies or {}))
+        self.entries = deque()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.wakeup = Wakeup()
+        self.received = 0
+        self.processed = 0
+        self.high_water = 0
+        self.dropped = dict.fromkeys(self.policies, 0)
+        self.coalesced = dict.fromkeys(self.policies, 0)
+
+    def put(self, channel, event, payload, key=None, stamp=0):
+        """Enqueue one payload.
+
+        :param str channel: The channel, e.g. :data:`TICKS`.
+        :param str event: The socket.io event name, or ``None``.
+        :param payload: The decoded payload.
+        :param key: The coalescing key within the channel, e.g. the asset.
+        :param int stamp: The :func:`time.monotonic_ns` receive time.
+        """
+        policy = self.policies.get(channel, KEEP)
+        with self.lock:
+            self.received += 1
+            if policy in (LATEST, COALESCE):
+                entry = self.pending.get((channel, key))
+                if entry is not None:
+                    if policy == LATEST:
+                        entry[2] = payload
+                        entry[4] = stamp
+                    else:
+                        rows = entry[2]
+                        rows.extend(payload)
+                        excess = len(rows) - self.coalesce_limit
+                        if excess > 0:
+                            del rows[:excess]
+                            self.dropped[channel] = self.dropped.get(channel, 0) + excess
+                    self.coalesced[channel] = self.coalesced.get(channel, 0) + 1
+                    return
+            if policy != KEEP and len(self.entries) >= self.capacity:
+                self.dropped[channel] = self.dropped.get(channel, 0) + 1
+                return
+            entry = [channel, event, payload, key, stamp]
+            if policy == COALESCE:
+                rows = list(payload)
+                if len(rows) > self.coalesce_limit:
+                    self.dropped[channel] = self.dropped.get(channel, 0) + len(rows) - self.coalesce_limit
+                    del rows[:-self.coalesce_limit]
+                entry[2] = rows
+            if policy in (LATEST, COALESCE):
+                self.pending[(channel, key)] = entry
+            self.entries.append(entry)
+            if len(self.entries) > self.high_water:
+                self.high_water = len(self.entries)
+        self.wakeup.set()
+
+    def pop(self):
+        with self.lock:
+            if not self.entries:
+                return None
+            entry = self.entries.popleft()
+            self.pending.pop((entry[0], entry[3]), None)
+            return entry
+
+    def drain(self):
+        """Run the handler for every queued entry in the calling thread."""
+        while True:
+            entry = self.pop()
+            if entry is None:
+                return
+            if self.observe is not None and entry[4]:
+                self.observe(entry[0], entry[3], time.monotonic_ns() - entry[4])
+            try:
+                self.handle(entry[1], entry[2])
+            except Exception:
+                logger.debug("Failed to process websocket message.", exc_info=True)
+            self.processed += 1
+
+    def start(self):
+        """Start the worker in a daemon thread."""
+        self.running = True
+        thread = threading.Thread(target=self.run_forever)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def run_forever(self):
+        while self.running:
+            self.wakeup.wait()
+            self.drain()
+
+    async def run(self):
+        """Run the worker as a task on the current event loop."""
+        self.wakeup.bind()
+        self.running = True
+        while self.running:
+            await self.wakeup.wait_async()
+            self.drain()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    @property
+    def depth(self):
+        return len(self.entries)
+
+    def stats(self):
+        """Return queue depth, high-water mark and per-channel counters."""
+        return {
+            "depth": len(self.entries),
+            "high_water": self.high_water,
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": dict(self.dropped),
+            "coalesced": dict(self.coalesced),
+        }
@@ -0,0 +1,180 @@
+"""Module for Quotex websocket metrics."""
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats(object):
+    """Class for rolling latency statistics.
+
+    Keeps running totals for every sample and the most recent ``size``
+    samples for percentiles. Values are recorded in nanoseconds and reported
+    in milliseconds.
+    """
+
+    def __init__(self, size=1024):
+        """
+        :param int size: How many recent samples are kept for percentiles.
+        """
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        """Record one latency sample.
+
+        :param int value: The latency in nanoseconds.
+        """
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """Return the ``q`` percentile of the recent samples in milliseconds.
+
+        :param float q: The percentile, between 0 and 100.
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * q / 100))
+        return ordered[index] / 1e6
+
+    def snapshot(self):
+        """Return the statistics as a dict of milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count / 1e6 if self.count else 0.0,
+            "max_ms": self.max / 1e6,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class BandwidthMeter(object):
+    """Class for bytes-on-wire versus decoded-bytes counters per event type.
+
+    The wire size of a message is its payload as received, i.e. compressed
+    when permessage-deflate was negotiated; the decoded size is the length
+    of the frame handed to the socket.io decoder. Frames that only complete
+    a packet later, such as ``451-`` headers waiting for their attachment,
+    are counted under the event of that packet.
+    """
+
+    def __init__(self):
+        self.events = {}
+        self.negotiated = None
+        self.lock = threading.Lock()
+
+    def record(self, event, wire, decoded, frames=1):
+        """Record the frames of one event.
+
+        :param str event: The event name, or the ingress channel of unnamed
+            payloads.
+        :param int wire: Bytes received on the wire.
+        :param int decoded: Bytes after decompression.
+        :param int frames: Number of websocket messages.
+        """
+        with self.lock:
+            counters = self.events.get(event)
+            if counters is None:
+                counters = self.events[event] = [0, 0, 0]
+            counters[0] += frames
+            counters[1] += wire
+            counters[2] += decoded
+
+    def stats(self):
+        """Return the counters per event and their totals."""
+        with self.lock:
+            events = {event: list(counters) for event, counters in self.events.items()}
+        wire = sum(counters[1] for counters in events.values())
+        decoded = sum(counters[2] for counters in events.values())
+        return {
+            "compression": self.negotiated,
+            "wire_bytes": wire,
+            "decoded_bytes": decoded,
+            "ratio": wire / decoded if decoded else 1.0,
+            "events": {
+                event: {
+                    "frames": frames,
+                    "wire_bytes": wire,
+                    "decoded_bytes": decoded,
+                    "ratio": wire / decoded if decoded else 1.0,
+                }
+                for event, (frames, wire, decoded) in events.items()
+            },
+        }
+
+
+class LatencyMonitor(object):
+    """Class for per-asset tick lag statistics.
+
+    Every frame is stamped with :func:`time.monotonic_ns` when it is
+    received. Two lags are kept per asset:
+
+    * ``server``: receive time minus the server timestamp of the tick. It
+      includes the clock offset between the server and this host.
+    * ``callback``: receive time to the start of the handler on the ingress
+      worker. Coalesced ticks are measured from their oldest row.
+    """
+
+    def __init__(self, size=1024):
+        """
+        :param int size: How many recent samples are kept per asset.
+        """
+        self.size = size
+        self.server = {}
+        self.callback = {}
+        self.epoch = time.time_ns() - time.monotonic_ns()
+
+    def stats(self, table, asset):
+        stats = table.get(asset)
+        if stats is None:
+            stats = table.setdefault(asset, LatencyStats(self.size))
+        return stats
+
+    def arrived(self, asset, server_time, stamp):
+        """Record the server-to-client lag of one tick.
+
+        :param str asset: The asset name.
+        :param float server_time: The server timestamp of the tick in seconds.
+        :param int stamp: The :func:`time.monotonic_ns` receive time.
+        """
+        stats = self.server.get(asset) or self.stats(self.server, asset)
+        stats.add(self.epoch + stamp - int(server_time * 1e9))
+
+    def delivered(self, asset, lag):
+        """Record the receive-to-callback lag of one tick, in nanoseconds."""
+        stats = self.callback.get(asset) or self.stats(self.callback, asset)
+        stats.add(lag)
+
+    def snapshot(self, asset=None):
+        """Return the lag statistics of one asset, or of every asset.
+
+        :param str asset: The asset name; every asset when ``None``.
+        """
+        assets = [asset] if asset is not None else sorted(set(self.server) | set(self.callback))
+        return {
+            name: {
+                "server": self.stats(self.server, name).snapshot(),
+                "callback": self.stats(self.callback, name).snapshot(),
+            }
+            for name in assets
+        }
+
+    def report(self, payload=None):
+        """Log p50/p99 of both lags per asset and re-anchor the wall clock."""
+        self.epoch = time.time_ns() - time.monotonic_ns()
+        for asset, lags in self.snapshot().items():
+            server, callback = lags["server"], lags["callback"]
+            logger.info(
+                f"{asset} lag p50/p99: server {server['p50_ms']:.1f}/{server['p99_ms']:.1f} ms, "
+                f"callback {callback['p50_ms']:.2f}/{callback['p99_ms']:.2f} ms "
+                f"({server['count']} ticks)"
+            )
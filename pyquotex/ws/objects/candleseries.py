@@ -0,0 +1,160 @@
+"""Module for Quotex candle series websocket object."""
+import numpy as np
+
+# Field order of a ``history/list/v2`` candle row.
+FIELDS = ("time", "open", "close", "high", "low", "ticks")
+DTYPES = {
+    "time": np.int64,
+    "open": np.float64,
+    "close": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "ticks": np.int64
+}
+
+
+class CandleSeries(object):
+    """Class storing the candles of one (asset, period) as columns.
+
+    Times, prices and tick counts live in contiguous NumPy arrays instead of
+    one six-key dict per candle, which takes about a fifth of the memory.
+    The ``time``, ``open``, ``high``, ``low``, ``close`` and ``ticks``
+    properties are views of those arrays and can be handed to
+    :class:`TechnicalIndicators <pyquotex.utils.indicators.TechnicalIndicators>`
+    as they are. Candles are kept sorted by time and unique per time.
+    """
+
+    def __init__(self, asset, period, capacity=64):
+        """
+        :param str asset: The asset of the candles.
+        :param int period: The candle period in seconds.
+        :param int capacity: Number of candles allocated up front.
+        """
+        self.asset = asset
+        self.period = period
+        self.size = 0
+        self.columns = {name: np.zeros(max(capacity, 1), dtype=DTYPES[name]) for name in FIELDS}
+
+    @classmethod
+    def from_rows(cls, asset, period, rows):
+        """Build a series from ``history/list/v2`` rows or candle dicts."""
+        series = cls(asset, period, capacity=len(rows))
+        series.merge(rows)
+        return series
+
+    def append(self, time, open, close, high, low, ticks=0, replace=True):
+        """Add the candle of ``time`` in O(1) when it is the newest one.
+
+        A candle with the time of the last one replaces it, e.g. while the
+        live candle is still forming; an older candle is merged in order.
+
+        :param bool replace: Replace the last candle on an equal time; if
+            ``False`` the stored candle is kept, as :meth:`merge` does.
+        :returns: The number of candles added.
+        """
+        if self.size and time < self.columns["time"][self.size - 1]:
+            return self.merge([(time, open, close, high, low, ticks)])
+        if not replace and self.size and time == self.columns["time"][self.size - 1]:
+            return 0
+        if not self.size or time > self.columns["time"][self.size - 1]:
+            if self.size == len(self.columns["time"]):
+                self.reserve(self.size * 2)
+            self.size += 1
+        index = self.size - 1
+        for name, value in zip(FIELDS, (time, open, close, high, low, ticks)):
+            self.columns[name][index] = value
+        return 1
+
+    def merge(self, candles):
+        """Merge candles in time order; stored candles win on equal times.
+
+        :param candles: A :class:`CandleSeries`, ``history/list/v2`` rows or
+            candle dicts such as ``history/load`` returns.
+        :returns: The number of candles added.
+        """
+        incoming = self.parse(candles)
+        if incoming is None:
+            return 0
+        stored = self.size
+        merged = {
+            name: np.concatenate((self.columns[name][:stored], incoming[name]))
+            for name in FIELDS
+        }
+        # np.unique keeps the first occurrence of a time, i.e. the stored one.
+        times, order = np.unique(merged["time"], return_index=True)
+        self.reserve(len(times))
+        for name in FIELDS:
+            self.columns[name][:len(times)] = merged[name][order]
+        self.size = len(times)
+        return self.size - stored
+
+    @staticmethod
+    def parse(candles):
+        if isinstance(candles, CandleSeries):
+            return {name: candles.column(name) for name in FIELDS} if candles.size else None
+        if candles is None or not len(candles):
+            return None
+        if isinstance(candles[0], dict):
+            values = [[candle.get(name, 0) for candle in candles] for name in FIELDS]
+        else:
+            values = list(zip(*candles))
+        return {name: np.asarray(column, dtype=DTYPES[name]) for name, column in zip(FIELDS, values)}
+
+    def reserve(self, capacity):
+        if capacity <= len(self.columns["time"]):
+            return
+        for name in FIELDS:
+            column = np.zeros(capacity, dtype=DTYPES[name])
+            column[:self.size] = self.columns[name][:self.size]
+            self.columns[name] = column
+
+    def column(self, name):
+        return self.columns[name][:self.size]
+
+    @property
+    def time(self):
+        return self.column("time")
+
+    @property
+    def open(self):
+        return self.column("open")
+
+    @property
+    def close(self):
+        return self.column("close")
+
+    @property
+    def high(self):
+        return self.column("high")
+
+    @property
+    def low(self):
+        return self.column("low")
+
+    @property
+    def ticks(self):
+        return self.column("ticks")
+
+    @property
+    def nbytes(self):
+        return sum(self.column(name).nbytes for name in FIELDS)
+
+    def to_list(self):
+        """Return the candles as the dicts :meth:`Quotex.get_candles` returns."""
+        values = [self.column(name).tolist() for name in FIELDS]
+        return [dict(zip(FIELDS, candle)) for candle in zip(*values)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("candle index out of range")
+        return {name: self.columns[name][index].item() for name in FIELDS}
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"CandleSeries({self.asset!r}, {self.period!r}, {self.size} candles)"
@@ -0,0 +1,64 @@
+"""Module for Quotex Tick websocket object."""
+import sys
+
+
+class Tick(object):
+    """Class for one Quotex price tick.
+
+    Ticks arrive as ``[symbol, time, price, direction]`` rows. A slotted
+    object keeps them far smaller than the ``{"time", "price"}`` dicts used
+    before, while still answering ``tick["price"]``, ``tick[2]`` and
+    ``symbol, time, price, direction = tick``.
+    """
+
+    __slots__ = ("symbol", "time", "price", "direction")
+
+    def __init__(self, symbol, time, price, direction=None):
+        self.symbol = symbol
+        self.time = time
+        self.price = price
+        self.direction = direction
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a tick from a ``[symbol, time, price, direction]`` row.
+
+        The symbol is interned so every tick of an asset shares one string.
+        """
+        return cls(sys.intern(row[0]), row[1], row[2], row[3])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self.__slots__:
+                raise KeyError(key)
+            return getattr(self, key)
+        return (self.symbol, self.time, self.price, self.direction)[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+    def __iter__(self):
+        return iter((self.symbol, self.time, self.price, self.direction))
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, other):
+        if isinstance(other, Tick):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"Tick({self.symbol!r}, {self.time!r}, {self.price!r}, {self.direction!r})"
+
+    def to_dict(self):
+        return {
+            "time": self.time,
+            "price": self.price
+        }
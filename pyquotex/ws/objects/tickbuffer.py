@@ -0,0 +1,148 @@
+"""Module for Quotex tick buffer websocket object."""
+import numpy as np
+from .tick import Tick
+
+# Direction stored for ticks that carry none.
+NO_DIRECTION = -1
+
+
+class TickBuffer(object):
+    """Class keeping the most recent ticks of one asset in fixed columns.
+
+    Times, prices and directions live in parallel NumPy arrays of twice the
+    capacity: every tick is written at its slot and at its mirror
+    ``capacity`` slots further, so the newest ``n`` ticks are always one
+    contiguous slice. Appending is O(1), memory never grows past the
+    capacity and the window methods return views, not copies.
+
+    The buffer still reads like the list of :class:`Tick
+    <pyquotex.ws.objects.tick.Tick>` it replaces: ``buffer[-1].price``,
+    ``len(buffer)`` and iteration work as before.
+    """
+
+    def __init__(self, symbol, capacity=10000):
+        """
+        :param str symbol: The asset of the ticks.
+        :param int capacity: Number of ticks kept.
+        """
+        self.symbol = symbol
+        self.capacity = capacity
+        self._time = np.zeros(capacity * 2, dtype=np.float64)
+        self._price = np.zeros(capacity * 2, dtype=np.float64)
+        self._direction = np.zeros(capacity * 2, dtype=np.int8)
+        self.head = 0
+        self.size = 0
+
+    def append(self, tick):
+        """Store a tick, overwriting the oldest one once the buffer is full."""
+        self.push(tick.time, tick.price, tick.direction)
+
+    def push(self, time, price, direction=None):
+        head = self.head
+        mirror = head + self.capacity
+        self._time[head] = self._time[mirror] = time
+        self._price[head] = self._price[mirror] = price
+        self._direction[head] = self._direction[mirror] = NO_DIRECTION if direction is None else direction
+        self.head = (head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def extend(self, ticks):
+        for tick in ticks:
+            self.push(tick.time, tick.price, tick.direction)
+
+    def last(self, count):
+        """Return the ``(times, prices)`` views of the newest ``count`` ticks."""
+        end = self.head + self.capacity
+        start = end - min(max(count, 0), self.size)
+        return self._time[start:end], self._price[start:end]
+
+    def since(self, timestamp):
+        """Return the ``(times, prices)`` views of the ticks newer than ``timestamp``."""
+        times, prices = self.last(self.size)
+        start = int(np.searchsorted(times, timestamp, side="right"))
+        return times[start:], prices[start:]
+
+    def last_seconds(self, seconds, now=None):
+        """Return the views of the ticks of the last ``seconds``.
+
+        :param now: The end of the window; defaults to the time of the newest
+            tick, so the window follows the server clock.
+        """
+        if not self.size:
+            return self.last(0)
+        if now is None:
+            now = self._time[self.head + self.capacity - 1]
+        return self.since(now - seconds)
+
+    @property
+    def times(self):
+        return self.last(self.size)[0]
+
+    @property
+    def prices(self):
+        return self.last(self.size)[1]
+
+    @property
+    def directions(self):
+        end = self.head + self.capacity
+        return self._direction[end - self.size:end]
+
+    def merge(self, ticks):
+        """Insert ticks in time order, skipping the times already stored.
+
+        Used for ticks recovered after an outage that are older than the
+        newest stored one; the stored tail is rewritten from the first
+        recovered time on.
+
+        :returns: The number of ticks added.
+        """
+        if not ticks:
+            return 0
+        times = self.times
+        start = int(np.searchsorted(times, min(tick.time for tick in ticks), side="left"))
+        kept = self.size - start
+        merged_time = np.concatenate((times[start:], [tick.time for tick in ticks]))
+        merged_price = np.concatenate((self.prices[start:], [tick.price for tick in ticks]))
+        merged_direction = np.concatenate((self.directions[start:], [
+            NO_DIRECTION if tick.direction is None else tick.direction for tick in ticks
+        ]))
+        # np.unique keeps the first occurrence, i.e. the stored tick.
+        merged_time, order = np.unique(merged_time, return_index=True)
+        self.head = (self.head - kept) % self.capacity
+        self.size = start
+        for time, price, direction in zip(
+                merged_time.tolist(),
+                merged_price[order].tolist(),
+                merged_direction[order].tolist()):
+            self.push(time, price, None if direction == NO_DIRECTION else direction)
+        return len(merged_time) - kept
+
+    def tick(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("tick index out of range")
+        slot = self.head + self.capacity - self.size + index
+        direction = int(self._direction[slot])
+        return Tick(
+            self.symbol,
+            float(self._time[slot]),
+            float(self._price[slot]),
+            None if direction == NO_DIRECTION else direction
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.tick(i) for i in range(*index.indices(self.size))]
+        return self.tick(index)
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self.tick(index)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"TickBuffer({self.symbol!r}, {self.size}/{self.capacity})"
@@ -0,0 +1,137 @@
+"""Module for Engine.IO v3 / socket.io v2 framing."""
+from .codec import Decoder
+
+# Engine.IO packet types.
+EIO_OPEN = "0"
+EIO_CLOSE = "1"
+EIO_PING = "2"
+EIO_PONG = "3"
+EIO_MESSAGE = "4"
+
+# socket.io packet types.
+CONNECT = 0
+DISCONNECT = 1
+EVENT = 2
+ACK = 3
+ERROR = 4
+BINARY_EVENT = 5
+BINARY_ACK = 6
+
+
+class Packet(object):
+    """Class for one socket.io packet."""
+
+    __slots__ = ("type", "id", "data", "attachments", "buffers")
+
+    def __init__(self, packet_type, packet_id=None, data=None, attachments=0):
+        self.type = packet_type
+        self.id = packet_id
+        self.data = data
+        self.attachments = attachments
+        self.buffers = []
+
+    @property
+    def event(self):
+        if self.type in (EVENT, BINARY_EVENT) and self.data:
+            return self.data[0]
+        return None
+
+    @property
+    def payload(self):
+        """The event arguments: one value, a list of values or ``None``."""
+        if self.type in (EVENT, BINARY_EVENT):
+            args = self.data[1:]
+        else:
+            args = self.data
+        if isinstance(args, list) and len(args) == 1:
+            return args[0]
+        return args or None
+
+
+def is_placeholder(value):
+    return isinstance(value, dict) and value.get("_placeholder") is True and "num" in value
+
+
+def reconstruct(data, buffers):
+    """Replace ``{"_placeholder": true, "num": n}`` markers by their attachments."""
+    if isinstance(data, list) and len(data) == 2 and is_placeholder(data[1]):
+        # The usual ``["event", {"_placeholder": true, "num": 0}]`` header.
+        return [data[0], buffers[data[1]["num"]]]
+    if isinstance(data, dict):
+        if is_placeholder(data):
+            return buffers[data["num"]]
+        return {key: reconstruct(value, buffers) for key, value in data.items()}
+    if isinstance(data, list):
+        return [reconstruct(value, buffers) for value in data]
+    return data
+
+
+class PacketDecoder(object):
+    """Class for the socket.io binary-attachment state machine.
+
+    A ``45N-`` (or ``46N-``) text frame announces a packet with ``N`` binary
+    attachments. The decoder holds that packet, collects the next ``N``
+    binary frames and only then emits it with every placeholder replaced by
+    its attachment. Any number of binary packets can follow each other on
+    the connection; each header is paired with its own attachments.
+    """
+
+    def __init__(self, decoder=None):
+        """
+        :param decoder: The :class:`Decoder <pyquotex.ws.codec.Decoder>`
+            used for JSON payloads.
+        """
+        self.decoder = decoder or Decoder()
+        self.loads = self.decoder.loads
+        self.reconstructing = None
+
+    def feed(self, message):
+        """Feed one websocket frame.
+
+        :param message: The raw websocket frame (``str`` or ``bytes``).
+        :returns: A complete :class:`Packet`, or ``None`` while attachments
+            are pending or for Engine.IO control frames.
+        """
+        if isinstance(message, (bytes, bytearray)):
+            buffer = self.decoder.decode_binary(message)
+            packet = self.reconstructing
+            if packet is None:
+                # A binary frame without header: hand it over on its own.
+                return Packet(BINARY_EVENT, data=[None, buffer])
+            packet.buffers.append(buffer)
+            if len(packet.buffers) < packet.attachments:
+                return None
+            self.reconstructing = None
+            packet.data = reconstruct(packet.data, packet.buffers)
+            packet.buffers = []
+            return packet
+
+        if not message or message[0] != EIO_MESSAGE:
+            return None
+        packet = self.parse(message)
+        if packet.attachments:
+            self.reconstructing = packet
+            return None
+        return packet
+
+    def parse(self, message):
+        """Parse the socket.io packet of an Engine.IO message frame."""
+        packet_type = int(message[1]) if len(message) > 1 else EVENT
+        index = 2
+        attachments = 0
+        if packet_type in (BINARY_EVENT, BINARY_ACK):
+            dash = message.index("-", index)
+            attachments = int(message[index:dash])
+            index = dash + 1
+        packet_id = None
+        if index < len(message) and message[index] != "[":
+            if message[index] == "/":
+                comma = message.find(",", index)
+                index = len(message) if comma < 0 else comma + 1
+            start = index
+            while index < len(message) and message[index].isdigit():
+                index += 1
+            if index > start:
+                packet_id = int(message[start:index])
+        data = self.loads(message[index:]) if index < len(message) else None
+        return Packet(packet_type, packet_id, data, attachments)
@@ -0,0 +1,119 @@
+"""Module for Quotex pending orders."""
+import threading
+from .correlator import ReplyCorrelator
+
+# States of a pending order.
+CREATED = "created"
+FOLLOWING = "following"
+OPENED = "opened"
+CANCELLED = "cancelled"
+
+
+class PendingOrders(object):
+    """Class indexing scheduled orders by ticket.
+
+    A ``pending/create`` request carries no request id, so its reply is
+    matched on the ``(asset, openTime)`` of the order, or to the only
+    waiting request when the reply does not echo them. Every ticket is then
+    indexed with its state: ``created`` once the server accepted it,
+    ``following`` once ``instruments/follow`` was sent, ``opened`` when the
+    deal opens at its scheduled time and ``cancelled`` when a cancel reply
+    names it. The most recent ``capacity`` tickets are kept.
+    """
+
+    def __init__(self, capacity=4096):
+        """
+        :param int capacity: Number of tickets kept in the index.
+        """
+        self.capacity = capacity
+        self.tickets = {}
+        self.created = ReplyCorrelator()
+        self.opened = ReplyCorrelator()
+        self.lock = threading.Lock()
+
+    def expect(self, asset, open_time):
+        """Return the future resolved by the ``pending/create`` reply of an order."""
+        return self.created.register((asset, open_time))
+
+    def discard(self, asset, open_time, future):
+        self.created.discard((asset, open_time), future)
+
+    def index(self, pending, state):
+        ticket = pending.get("ticket")
+        with self.lock:
+            self.tickets[ticket] = dict(pending, state=state)
+            if len(self.tickets) > self.capacity:
+                del self.tickets[next(iter(self.tickets))]
+        return ticket
+
+    def on_created(self, message):
+        """Index the tickets of a ``pending/create`` or ``pending/list`` reply."""
+        pending = message["pending"]
+        if isinstance(pending, list):
+            for order in pending:
+                if order.get("ticket") not in self.tickets:
+                    self.index(order, CREATED)
+            return
+        self.index(pending, CREATED)
+        if not self.created.resolve((pending.get("asset"), pending.get("openTime")), message):
+            self.created.resolve_single(message)
+
+    def follow(self, ticket):
+        self.set_state(ticket, FOLLOWING)
+
+    def on_opened(self, message):
+        """Mark the pending order of an opened deal and wake its waiters.
+
+        :returns: ``True`` if the deal belongs to an indexed ticket.
+        """
+        ticket = message.get("ticket")
+        if not self.set_state(ticket, OPENED, deal=message.get("id")):
+            return False
+        self.opened.resolve(ticket, self.get(ticket))
+        return True
+
+    def on_cancelled(self, ticket):
+        return self.set_state(ticket, CANCELLED)
+
+    def set_state(self, ticket, state, **fields):
+        with self.lock:
+            order = self.tickets.get(ticket)
+            if order is None:
+                return False
+            order["state"] = state
+            order.update(fields)
+        return True
+
+    def get(self, ticket):
+        """Return the indexed order of a ticket, or ``None``."""
+        return self.tickets.get(ticket)
+
+    def state(self, ticket):
+        order = self.tickets.get(ticket)
+        return order["state"] if order else None
+
+    async def wait_opened(self, ticket):
+        """Wait for the deal of a pending order to open.
+
+        :returns: The indexed order, its ``deal`` being the id of the opened deal.
+        """
+        future = self.opened.register(ticket)
+        order = self.get(ticket)
+        if order is not None and order["state"] == OPENED:
+            self.opened.discard(ticket, future)
+            return order
+        try:
+            return await future
+        except BaseException:
+            self.opened.discard(ticket, future)
+            raise
+
+    def stats(self):
+        states = {}
+        for order in list(self.tickets.values()):
+            states[order["state"]] = states.get(order["state"], 0) + 1
+        return {
+            "tickets": len(self.tickets),
+            "states": states,
+            "waiting": self.created.stats()["waiting"] + self.opened.stats()["waiting"],
+        }
@@ -0,0 +1,224 @@
+"""Module for Quotex websocket connection pool."""
+import json
+import asyncio
+import logging
+import threading
+from .client import WebsocketClient
+from .async_client import AsyncWebsocketClient
+from .sender import event_name
+from .ingress import EVENTS
+from .dispatcher import CONNECT, DISCONNECT
+
+logger = logging.getLogger(__name__)
+
+# Market-data events routed to the connection that owns their asset.
+SUBSCRIBE_EVENTS = ("instruments/update", "chart_notification/get", "depth/follow")
+UNSUBSCRIBE_EVENTS = ("depth/unfollow", "subfor")
+# Events a market connection handles itself instead of forwarding them.
+CONTROL_EVENTS = (CONNECT, DISCONNECT, "s_authorization", "authorization/reject")
+# Events a market connection forwards to the shared ingress besides ticks
+# and sentiment rows, which always are.
+DATA_EVENTS = ("history/list/v2",)
+
+
+def frame_asset(data):
+    """Return the asset of a ``42["event",payload]`` market-data frame."""
+    comma = data.find(",")
+    if comma < 0:
+        return None
+    payload = json.loads(data[comma + 1:-1])
+    if isinstance(payload, dict):
+        return payload.get("asset")
+    return payload
+
+
+class MarketConnection(object):
+    """Mixin for a pooled websocket that only carries market data.
+
+    It handles its own socket.io connect, disconnect and authorization
+    events: on every connect it authorizes with the session's SSID and
+    replays the subscriptions assigned to it, and a disconnect only rejoins
+    its own namespace. Only market data, i.e. ticks, sentiment and
+    ``history/list/v2``, goes to the pool's shared :class:`IngressQueue
+    <pyquotex.ws.ingress.IngressQueue>`, so the connection flags, the
+    outage tracking and the streams of the order connection are left alone.
+    """
+
+    owns_ingress = False
+
+    def __init__(self, api, pool, index):
+        """
+        :param api: The instance of :class:`QuotexAPI
+            <pyquotex.api.QuotexAPI>`.
+        :param pool: The :class:`ConnectionPool` owning the connection.
+        :param int index: The position of the connection in the pool.
+        """
+        self.pool = pool
+        self.index = index
+        self.subscriptions = {}
+        self.accepted = False
+        super().__init__(api)
+
+    def create_ingress(self):
+        return self.pool.ingress
+
+    def subscribe(self, event, asset, data):
+        if event in UNSUBSCRIBE_EVENTS:
+            for key in [key for key in self.subscriptions if key[1] == asset]:
+                del self.subscriptions[key]
+        else:
+            self.subscriptions[(event, asset)] = data
+        self.send(data)
+
+    def forward(self, event, payload, stamp):
+        if event in CONTROL_EVENTS:
+            self.dispatcher.handle(event, payload)
+        elif event in DATA_EVENTS:
+            self.ingress.put(EVENTS, event, payload, stamp=stamp)
+        else:
+            logger.debug(f"Market connection {self.index} ignored {event}.")
+
+    def on_connect(self, payload):
+        self.send(self.api.ssid.frame(self.api.state.SSID))
+        for data in self.subscriptions.values():
+            self.send(data)
+
+    def on_disconnect(self, payload):
+        logger.info(f"Market connection {self.index} disconnected by the platform, reconnecting.")
+        self.accepted = False
+        self.send("40")
+
+    def on_authorization(self, payload):
+        self.accepted = True
+
+    def on_authorization_reject(self, payload):
+        logger.warning(f"Market connection {self.index}: token rejected.")
+        self.accepted = False
+
+    def on_open(self, wss):
+        logger.info(f"Market connection {self.index} connected.")
+        self.connected = True
+        self.sender.resume()
+
+    def on_close(self, wss, close_status_code, close_msg):
+        logger.info(f"Market connection {self.index} closed.")
+        self.connected = False
+        self.accepted = False
+        self.sender.pause()
+
+    def on_error(self, wss, error):
+        logger.error(f"Market connection {self.index}: {error}")
+
+
+class ThreadMarketConnection(MarketConnection, WebsocketClient):
+    """Class for a pooled market-data websocket on a daemon thread."""
+
+
+class AsyncMarketConnection(MarketConnection, AsyncWebsocketClient):
+    """Class for a pooled market-data websocket on the event loop."""
+
+
+class ConnectionPool(object):
+    """Class for spreading market-data subscriptions over several websockets.
+
+    The API's own websocket becomes the order connection: orders, account
+    and history requests keep going through it, so they never queue behind
+    quote traffic. ``instruments/update``, ``chart_notification/get`` and
+    ``depth/follow`` are routed to ``size`` market connections opened with
+    the same SSID; every asset sticks to the least loaded connection at its
+    first subscription. All connections feed one ingress queue, so handlers,
+    :attr:`QuotexAPI.realtime_price <pyquotex.api.QuotexAPI.realtime_price>`
+    and tick subscribers see a single merged event stream.
+    """
+
+    def __init__(self, api, size):
+        """
+        :param api: The instance of :class:`QuotexAPI
+            <pyquotex.api.QuotexAPI>`.
+        :param int size: Number of market connections.
+        """
+        self.api = api
+        self.size = size
+        self.ingress = api.websocket_client.ingress
+        self.connections = []
+        self.threads = []
+        self.assets = {}
+
+    @property
+    def orders(self):
+        """The order connection, i.e. the API's own websocket client."""
+        return self.api.websocket_client
+
+    async def start(self, ssl_context=None, options=None):
+        """Open the market connections.
+
+        :param ssl_context: The :class:`ssl.SSLContext` of the asyncio transport.
+        :param dict options: ``run_forever`` keyword arguments of the thread
+            transport.
+        """
+        for index in range(self.size):
+            if isinstance(self.orders, AsyncWebsocketClient):
+                connection = AsyncMarketConnection(self.api, self, index)
+                await connection.connect(ssl_context)
+            else:
+                connection = ThreadMarketConnection(self.api, self, index)
+                thread = threading.Thread(target=connection.wss.run_forever, kwargs=options)
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+            self.connections.append(connection)
+
+    def assign(self, asset):
+        """Return the market connection owning an asset, assigning it if new."""
+        connection = self.assets.get(asset)
+        if connection is None:
+            load = [0] * len(self.connections)
+            for owner in self.assets.values():
+                load[owner.index] += 1
+            connection = self.connections[load.index(min(load))]
+            self.assets[asset] = connection
+        return connection
+
+    def send(self, data, urgent=False):
+        """Send a frame through the connection its event belongs to.
+
+        :param str data: The websocket frame.
+        :param bool urgent: Put the frame ahead of already queued frames.
+        """
+        event = event_name(data)
+        if self.connections and (event in SUBSCRIBE_EVENTS or event in UNSUBSCRIBE_EVENTS):
+            asset = frame_asset(data)
+            if asset in self.assets or (asset is not None and event in SUBSCRIBE_EVENTS):
+                self.assign(asset).subscribe(event, asset, data)
+                return
+        self.orders.send(data, urgent)
+
+    async def close(self):
+        for connection in self.connections:
+            if isinstance(connection, AsyncWebsocketClient):
+                await connection.close()
+            else:
+                connection.stop()
+                connection.wss.close()
+        for thread in self.threads:
+            await asyncio.to_thread(thread.join, 5)
+        self.connections = []
+        self.threads = []
+        self.assets = {}
+
+    def stats(self):
+        """Return the assets and the send-queue counters of every connection."""
+        stats = [{
+            "role": "orders",
+            "assets": [],
+            "sender": self.orders.sender.stats()
+        }]
+        for connection in self.connections:
+            stats.append({
+                "role": "market",
+                "assets": [asset for asset, owner in self.assets.items() if owner is connection],
+                "connected": connection.connected,
+                "accepted": connection.accepted,
+                "sender": connection.sender.stats()
+            })
+        return stats
@@ -0,0 +1,156 @@
+"""Module for Quotex websocket outbound queue."""
+import time
+import logging
+import threading
+from collections import deque
+from .metrics import LatencyStats
+from .wakeup import Wakeup
+
+logger = logging.getLogger(__name__)
+
+
+def event_name(data):
+    """Return the socket.io event name of a ``42["event",...]`` frame."""
+    if data.startswith('42["'):
+        return data[4:data.find('"', 4)]
+    return None
+
+
+class SendQueue(object):
+    """Class for the single-writer outbound websocket queue.
+
+    Any thread or coroutine can enqueue a frame without blocking; one writer
+    (a daemon thread for the thread transport, a task for the asyncio
+    transport) drains the queue and writes the frames back-to-back. Identical
+    frames of idempotent events can be coalesced while they wait.
+
+    Frames are held while the socket is down and written after the
+    reconnection, except frames of unsafe events such as ``orders/open``:
+    they are refused while paused and dropped if they were queued before the
+    last :meth:`resume`, since their caller has most likely given up on them
+    and replaying them would open a trade it believes failed.
+    """
+
+    def __init__(self, write, coalesce=(), unsafe=()):
+        """
+        :param write: Callable (or coroutine function for :meth:`run`) that
+            writes one frame to the socket.
+        :param coalesce: Event names whose identical pending frames are
+            written only once.
+        :param unsafe: Event names whose frames are never held over a
+            disconnection.
+        """
+        self.write = write
+        self.coalesce = frozenset(coalesce)
+        self.unsafe = frozenset(unsafe)
+        self.frames = deque()
+        self.queued = set()
+        self.paused = True
+        self.resumed_at = 0
+        self.running = False
+        self.sent = 0
+        self.coalesced = 0
+        self.refused = 0
+        self.latency = LatencyStats()
+        self.wakeup = Wakeup()
+
+    def put(self, data, urgent=False):
+        """Enqueue one frame.
+
+        :param str data: The websocket frame.
+        :param bool urgent: Put the frame ahead of everything already queued.
+        """
+        if self.paused and self.unsafe and event_name(data) in self.unsafe:
+            self.refuse(data)
+            return
+        if self.coalesce and event_name(data) in self.coalesce:
+            if data in self.queued:
+                self.coalesced += 1
+                return
+            self.queued.add(data)
+        item = (data, time.monotonic_ns())
+        if urgent:
+            self.frames.appendleft(item)
+        else:
+            self.frames.append(item)
+        self.wakeup.set()
+
+    def pop(self):
+        data, queued_at = self.frames.popleft()
+        self.queued.discard(data)
+        return data, queued_at
+
+    def refuse(self, data):
+        self.refused += 1
+        logger.warning(f"Dropped {event_name(data)} frame, the websocket is disconnected.")
+
+    def stale(self, data, queued_at):
+        """Tell whether a frame of an unsafe event was queued before the last resume."""
+        if queued_at < self.resumed_at and self.unsafe and event_name(data) in self.unsafe:
+            self.refuse(data)
+            return True
+        return False
+
+    def done(self, queued_at):
+        self.latency.add(time.monotonic_ns() - queued_at)
+        self.sent += 1
+
+    def pause(self):
+        """Hold queued frames until :meth:`resume`, e.g. while disconnected."""
+        self.paused = True
+
+    def resume(self):
+        self.resumed_at = time.monotonic_ns()
+        self.paused = False
+        self.wakeup.set()
+
+    def start(self):
+        """Start the writer in a daemon thread."""
+        self.running = True
+        thread = threading.Thread(target=self.run_forever)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def run_forever(self):
+        while self.running:
+            self.wakeup.wait()
+            while self.frames and not self.paused and self.running:
+                data, queued_at = self.pop()
+                if self.stale(data, queued_at):
+                    continue
+                try:
+                    self.write(data)
+                except Exception as e:
+                    logger.error(f"Failed to send websocket frame: {e}")
+                self.done(queued_at)
+
+    async def run(self):
+        """Run the writer as a task on the current event loop."""
+        self.wakeup.bind()
+        self.running = True
+        while self.running:
+            await self.wakeup.wait_async()
+            while self.frames and not self.paused and self.running:
+                data, queued_at = self.pop()
+                if self.stale(data, queued_at):
+                    continue
+                try:
+                    await self.write(data)
+                except Exception as e:
+                    logger.error(f"Failed to send websocket frame: {e}")
+                self.done(queued_at)
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    def stats(self):
+        """Return queue depth, counters and send-queue latency."""
+        return {
+            "depth": len(self.frames),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "refused": self.refused,
+            "latency": self.latency.snapshot(),
+        }
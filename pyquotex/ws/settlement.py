@@ -0,0 +1,84 @@
+"""Module for Quotex trade settlement."""
+import threading
+from .broker import TickSubscription
+from .correlator import ReplyCorrelator
+
+
+class SettlementTracker(object):
+    """Class turning ``deals`` messages into per-ticket results.
+
+    Every deal of a message is settled on its own: its ``win`` flag comes
+    from the deal's own profit, the futures waiting on its ticket are
+    resolved and the deal is published to every settlement stream. Results
+    nobody waited for are kept for the most recent ``capacity`` tickets, so
+    a trade that closes before :meth:`wait` is called is still found.
+    """
+
+    def __init__(self, capacity=4096):
+        """
+        :param int capacity: Number of settled tickets kept for lookup.
+        """
+        self.capacity = capacity
+        self.results = {}
+        self.waiters = ReplyCorrelator()
+        self.subscribers = ()
+        self.lock = threading.Lock()
+        self.settled = 0
+
+    def settle(self, message):
+        """Settle every deal of a ``deals`` message.
+
+        :returns: The number of deals settled.
+        """
+        for deal in message["deals"]:
+            deal["win"] = deal.get("profit", 0) > 0
+            deal["game_state"] = 1
+            ticket = deal.get("id")
+            with self.lock:
+                self.results[ticket] = deal
+                if len(self.results) > self.capacity:
+                    del self.results[next(iter(self.results))]
+            self.waiters.resolve(ticket, deal)
+            for subscription in self.subscribers:
+                subscription.push(deal)
+            self.settled += 1
+        return len(message["deals"])
+
+    def get(self, ticket):
+        """Return the settled deal of a ticket, or ``None`` while it is open."""
+        return self.results.get(ticket)
+
+    async def wait(self, ticket):
+        """Wait for the deal of a ticket to close.
+
+        :param ticket: The ``id`` of the order reply.
+        :returns: The settled deal, with ``win`` and ``profit``.
+        """
+        future = self.waiters.register(ticket)
+        deal = self.get(ticket)
+        if deal is not None:
+            self.waiters.discard(ticket, future)
+            return deal
+        try:
+            return await future
+        except BaseException:
+            self.waiters.discard(ticket, future)
+            raise
+
+    def subscribe(self, maxlen=1024):
+        """Create a stream of closed deals; must be called from a coroutine."""
+        subscription = TickSubscription(self, None, maxlen)
+        with self.lock:
+            self.subscribers = self.subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers = tuple(s for s in self.subscribers if s is not subscription)
+
+    def stats(self):
+        return {
+            "settled": self.settled,
+            "waiting": self.waiters.stats()["waiting"],
+            "streams": len(self.subscribers),
+        }
@@ -0,0 +1,314 @@
+"""Module for Quotex websocket subscription registry."""
+import time
+import logging
+import threading
+from .objects.tick import Tick
+
+logger = logging.getLogger(__name__)
+
+# Kinds of streams besides the reference-counted candle streams.
+SIGNALS = "signals"
+
+
+class SubscriptionRegistry(object):
+    """Class recording every stream the user started.
+
+    Candle streams are reference-counted per ``(asset, period)``: subscribe
+    frames are only sent on a 0→1 transition and unsubscribe frames on a
+    1→0 transition, and the frames this avoids are counted.
+
+    When the connection drops, either the transport closes or the platform
+    sends a socket.io ``41`` disconnect, the registry notes the outage and
+    the last tick of every followed asset. On the next socket.io connect it
+    re-authorizes, replays every stream in one batch and asks ``history/load``
+    for the missed span. The ticks of the ``history/list/v2`` reply and the
+    candles of the ``history/load`` reply are merged into the API state, so
+    indicators computed from it stay continuous.
+    """
+
+    def __init__(self, api):
+        """
+        :param api: The instance of :class:`QuotexAPI
+            <pyquotex.api.QuotexAPI>`.
+        """
+        self.api = api
+        self.streams = {}
+        self.refs = {}
+        self.asset_refs = {}
+        self.internal = {}
+        self.orders = {}
+        self.lock = threading.Lock()
+        self.outage = None
+        self.backfill = {}
+        self.pending = {}
+        self.replays = 0
+        self.backfilled = 0
+        self.sent = 0
+        self.saved = 0
+
+    def attach(self, api):
+        """Carry the recorded streams over to a new :class:`QuotexAPI <pyquotex.api.QuotexAPI>`."""
+        self.api = api
+        api.subscriptions = self
+
+    def add(self, kind, asset=None, period=0):
+        """Record a started stream that is not reference-counted, e.g. :data:`SIGNALS`.
+
+        :param str kind: The kind of stream.
+        :param str asset: The asset name.
+        :param int period: The candle period in seconds.
+        """
+        with self.lock:
+            self.streams[(kind, asset)] = period
+
+    def remove(self, kind, asset=None):
+        with self.lock:
+            self.streams.pop((kind, asset), None)
+
+    def acquire(self, asset, period=0, internal=False):
+        """Take a reference on the candle stream of ``(asset, period)``.
+
+        ``instruments/update`` is only sent when the first reference on the
+        ``(asset, period)`` pair is taken, ``chart_notification/get`` and
+        ``depth/follow`` only for the first reference on the asset.
+
+        :param bool internal: Count the reference as taken by :meth:`ensure`.
+        :returns: The number of frames sent.
+        """
+        with self.lock:
+            key = (asset, period)
+            self.refs[key] = self.refs.get(key, 0) + 1
+            self.asset_refs[asset] = self.asset_refs.get(asset, 0) + 1
+            if internal:
+                self.internal[key] = self.internal.get(key, 0) + 1
+            new_period = self.refs[key] == 1
+            new_asset = self.asset_refs[asset] == 1
+        sent = 0
+        if new_asset:
+            self.api.subscribe_realtime_candle(asset, period)
+            sent += 1
+        elif new_period:
+            self.api.instruments_update(asset, period)
+            sent += 1
+        if new_asset:
+            self.api.chart_notification(asset)
+            self.api.follow_candle(asset)
+            sent += 2
+        with self.lock:
+            self.sent += sent
+            self.saved += 3 - sent
+        return sent
+
+    def ensure(self, asset, period=0, history=False):
+        """Make sure the candle stream of ``(asset, period)`` is subscribed.
+
+        Internal callers (orders, history fetches) use this instead of
+        :meth:`acquire` and drop their reference with :meth:`done` once the
+        history reply arrived or the order settled, so a stream the user
+        never subscribed to is unsubscribed again. :meth:`release` leaves
+        internal references alone.
+
+        :param bool history: Send ``instruments/update`` again, even for a
+            running stream, because the caller waits for the fresh
+            ``history/list/v2`` snapshot it triggers.
+        :returns: The number of frames sent.
+        """
+        sent = self.acquire(asset, period, internal=True)
+        if history and not sent:
+            self.api.instruments_update(asset, period)
+            with self.lock:
+                self.sent += 1
+                self.saved -= 1
+            sent = 1
+        return sent
+
+    def release(self, asset, period=None):
+        """Drop a reference on ``(asset, period)``, or every reference on the asset.
+
+        ``subfor`` and ``depth/unfollow`` are only sent when the last
+        reference on the asset is dropped.
+
+        :returns: The number of frames sent.
+        """
+        with self.lock:
+            counts = {}
+            for key, count in self.refs.items():
+                held = count - self.internal.get(key, 0)
+                if key[0] == asset and period in (None, key[1]) and held > 0:
+                    counts[key] = held if period is None else 1
+            last = self.unref(asset, counts)
+        return self.unsubscribe(asset, last)
+
+    def done(self, asset, period=0):
+        """Drop a reference taken by :meth:`ensure`.
+
+        :returns: The number of frames sent.
+        """
+        key = (asset, period)
+        with self.lock:
+            if not self.internal.get(key):
+                return 0
+            self.internal[key] -= 1
+            if not self.internal[key]:
+                del self.internal[key]
+            last = self.unref(asset, {key: 1})
+        return self.unsubscribe(asset, last)
+
+    def hold(self, ticket, asset, period=0):
+        """Keep the :meth:`ensure` reference of an opened order until its ticket settles."""
+        with self.lock:
+            self.orders[ticket] = (asset, period)
+        if self.api.settlements.get(ticket) is not None:
+            self.settled(ticket)
+
+    def settled(self, ticket):
+        """Drop the reference held for a settled ticket.
+
+        :returns: The number of frames sent.
+        """
+        with self.lock:
+            key = self.orders.pop(ticket, None)
+        if key is None:
+            return 0
+        return self.done(*key)
+
+    def unref(self, asset, counts):
+        """Drop references; called with the lock held.
+
+        :param dict counts: The number of references dropped per key.
+        :returns: ``True`` if the asset lost its last reference.
+        """
+        dropped = 0
+        for key, count in counts.items():
+            self.refs[key] -= count
+            dropped += count
+            if self.refs[key] <= 0:
+                del self.refs[key]
+        if not dropped:
+            return False
+        self.asset_refs[asset] -= dropped
+        if self.asset_refs[asset] > 0:
+            self.saved += 2
+            return False
+        del self.asset_refs[asset]
+        self.backfill.pop(asset, None)
+        for index in [index for index, key in self.pending.items() if key[0] == asset]:
+            del self.pending[index]
+        return True
+
+    def unsubscribe(self, asset, last):
+        if not last:
+            return 0
+        self.api.unsubscribe_realtime_candle(asset)
+        self.api.unfollow_candle(asset)
+        with self.lock:
+            self.sent += 2
+        return 2
+
+    def assets(self):
+        return list(self.asset_refs)
+
+    def disconnected(self):
+        """Note the start of an outage and the last tick of every asset."""
+        if self.outage is not None:
+            return
+        self.outage = time.time()
+        with self.lock:
+            for asset in self.assets():
+                prices = self.api.realtime_price.get(asset)
+                self.backfill[asset] = prices[-1].time if prices else self.outage
+
+    def replay(self):
+        """Resubscribe every recorded stream and request the missed history.
+
+        :returns: The number of streams replayed.
+        """
+        outage, self.outage = self.outage, None
+        with self.lock:
+            periods = list(self.refs)
+            streams = list(self.streams)
+            # Read before any reply can pop it: every period of an asset
+            # backfills from the same last tick.
+            backfill = dict(self.backfill)
+        for kind, asset in streams:
+            if kind == SIGNALS:
+                self.api.signals_subscribe()
+        followed = set()
+        for asset, period in periods:
+            if asset in self.api.realtime_price:
+                self.api.instruments_update(asset, period)
+            else:
+                self.api.subscribe_realtime_candle(asset, period)
+            if asset not in followed:
+                followed.add(asset)
+                self.api.chart_notification(asset)
+                self.api.follow_candle(asset)
+            since = backfill.get(asset)
+            if since is not None and period:
+                offset = int(time.time() - since) + period
+                offset -= offset % -period
+                index = self.api.history_replies.next_id()
+                with self.lock:
+                    self.pending[index] = (asset, period)
+                self.api.get_candles(asset, index, time.time(), offset, period)
+        count = len(streams) + len(periods)
+        if count:
+            self.replays += 1
+            gap = time.time() - outage if outage else 0
+            logger.info(f"Replayed {count} streams after a {gap:.1f}s outage.")
+        return count
+
+    def on_connect(self):
+        """Handle a socket.io connect: replay the streams after an outage."""
+        if self.outage is None:
+            return
+        self.api.ssid(self.api.state.SSID)
+        self.replay()
+
+    def merge_ticks(self, asset, history):
+        """Merge the ticks of a ``history/list/v2`` reply missed during the outage.
+
+        Ticks newer than the last stored one are appended and published like
+        live ticks; older ticks are inserted in time order.
+        """
+        since = self.backfill.pop(asset, None)
+        prices = self.api.realtime_price.get(asset)
+        if since is None or prices is None or not history:
+            return 0
+        missed = [
+            Tick(asset, row[0], row[1], row[2] if len(row) > 2 else None)
+            for row in history if row[0] > since
+        ]
+        last = prices[-1].time if prices else since
+        added = prices.merge([tick for tick in missed if tick.time <= last])
+        for tick in missed:
+            if tick.time > last:
+                prices.append(tick)
+                self.api.tick_broker.publish(tick)
+                added += 1
+        self.backfilled += added
+        return added
+
+    def merge_candles(self, index, candles):
+        """Merge the candles of a ``history/load`` reply into the candle series of the stream.
+
+        :param index: The request index the reply echoes, which identifies
+            the ``(asset, period)`` it backfills.
+        """
+        with self.lock:
+            key = self.pending.pop(index, None)
+        if key is None or not candles:
+            return 0
+        return self.api.get_candle_series(*key).merge(candles)
+
+    def stats(self):
+        return {
+            "streams": len(self.streams) + len(self.refs),
+            "refs": {f"{asset},{period}": count for (asset, period), count in self.refs.items()},
+            "internal_refs": sum(self.internal.values()),
+            "frames_sent": self.sent,
+            "frames_saved": self.saved,
+            "replays": self.replays,
+            "backfilled_ticks": self.backfilled,
+            "pending_backfill": sorted(f"{asset},{period}" for asset, period in self.pending.values()),
+        }
@@ -0,0 +1,41 @@
+"""Module for waking a websocket worker from any thread."""
+import asyncio
+import threading
+
+
+class Wakeup(object):
+    """Class to wake one consumer from any thread or coroutine.
+
+    It is a :class:`threading.Event` until :meth:`bind` is called from a
+    running event loop; from then on it is an :class:`asyncio.Event` that
+    other threads set through ``call_soon_threadsafe``.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.loop = None
+        self.loop_thread = None
+
+    def bind(self):
+        """Switch to an :class:`asyncio.Event` on the running loop."""
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.event = asyncio.Event()
+        self.event.set()
+
+    def set(self):
+        if self.loop is None or threading.get_ident() == self.loop_thread:
+            self.event.set()
+        elif not self.event.is_set() and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.event.set)
+
+    def wait(self, timeout=None):
+        """Block the calling thread until woken, then re-arm."""
+        woken = self.event.wait(timeout)
+        self.event.clear()
+        return woken
+
+    async def wait_async(self):
+        """Wait on the event loop until woken, then re-arm."""
+        await self.event.wait()
+        self.event.clear()